@@ -1,9 +1,13 @@
 import pygame
 import sys
 import src.core.config as cfg # We import the module object so we can write to it
-from .config import TARGET_FPS # Constants like this are fine
-from src.engine.audio import AudioEngine
+from .config import TARGET_FPS, HITCH_LOG_FILE # Constants like this are fine
+from .timing import FrameTimer, FrameLimiter
+from .profiler import FrameProfiler
+from .quality import QualityGovernor
+from src.engine.audio import AudioEngine, DEFAULT_AUDIO_BUFFER
 from src.engine.storage import Storage
+from src.engine.fetch import FetchService
 
 class TosokuApp:
     def __init__(self, state_dict, start_state):
@@ -12,19 +16,30 @@ class TosokuApp:
             ctypes.windll.shcore.SetProcessDpiAwareness(1)
         except Exception:
             pass # Not on Windows or older version, ignore
+
+        # Settings first: the mixer has to be opened (with the saved buffer size) before
+        # pygame.init(), otherwise init() opens it with its own defaults.
+        self.fetcher = FetchService() # Every network GET; results come back in run()
+        self.storage = Storage(self.fetcher)
+        self.global_settings = self.storage.load_global_settings()
+        self.audio = AudioEngine(self.global_settings.get("audio_buffer", DEFAULT_AUDIO_BUFFER))
         pygame.init()
-        pygame.mixer.pre_init(44100, -16, 1, 512)
 
         pygame.key.set_repeat(400, 30) 
         
-        self.clock = pygame.time.Clock()
-        self.storage = Storage()
-        self.audio = AudioEngine()
+        # Timing (dt) and frame limiting are separate: the limiter only paces the loop
+        self.timer = FrameTimer()
+        self.limiter = FrameLimiter(TARGET_FPS)
+        # Per-stage frame timings (F3 overlay); frames over one TARGET_FPS period go to the hitch log
+        self.profiler = FrameProfiler(int(1e9 / TARGET_FPS), HITCH_LOG_FILE)
         self.debug_font = pygame.font.SysFont("arial", 16)
         pygame.display.set_caption("TSK AimTrainer (TAT) Alpha v0.3")
         
-        # --- NEW: LOAD SAVED RESOLUTION ---
-        self.global_settings = self.storage.load_global_settings()
+        # --- NEW: LOAD SAVED RESOLUTION --- (settings were loaded above)
+
+        # Render quality: "AUTO" lets the governor follow frame times, or a fixed level name
+        self.quality = QualityGovernor(TARGET_FPS)
+        self.quality.set_mode(self.global_settings.get("quality", "AUTO"))
         
         # Ensure Sensitivity exists (Default 100%)
         if "sensitivity" not in self.global_settings:
@@ -52,7 +67,8 @@ class TosokuApp:
              self.global_settings.get("miss_vol", 0.3),
              self.global_settings.get("hit_freq", 150),
              self.global_settings.get("miss_freq", 100),
-             self.global_settings.get("tick_rate", 20)
+             self.global_settings.get("tick_rate", 20),
+             self.global_settings.get("pitch_follow", False)
         )
         
         self.state_dict = state_dict
@@ -93,16 +109,30 @@ class TosokuApp:
             self.state = self.state_dict[self.state_name]
             
         self.state.startup({}) 
+        self.timer.tick()
+        prof = self.profiler
         while True:
-            dt = self.clock.tick(TARGET_FPS) / 1000.0
-            self.handle_events()
-            self.update(dt)
+            self.limiter.wait()
+            dt = self.timer.tick()
+            prof.begin_frame()
+            state_name = self.state_name
+            with prof.stage("events"):
+                self.fetcher.dispatch() # Finished downloads -> their callbacks, on this thread
+                self.handle_events()
+            with prof.stage("update"): self.update(dt)
             self.draw()
+            prof.end_frame(state_name)
+            self.quality.observe(prof.last_frame_ns)
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.quit()
+
+            # F3 toggles the profiler overlay in any state
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.global_settings["show_profiler"] = not self.global_settings.get("show_profiler", False)
+                continue
     
             self.state.handle_event(event)
 
@@ -112,18 +142,46 @@ class TosokuApp:
         self.state.update(dt)
 
     def draw(self):
-        self.state.draw(self.screen)
+        prof = self.profiler
+        with prof.stage("draw"): # GameState splits this further (graph/hud/particles)
+            self.state.draw(self.screen)
         # --- FPS COUNTER ---
         if self.global_settings.get("show_fps", False):
-            fps = int(self.clock.get_fps())
+            fps = int(self.timer.get_fps())
             fps_col = (0, 255, 0) if fps > 140 else (255, 255, 0)
-            fps_surf = self.debug_font.render(f"FPS: {fps}", True, fps_col)
+            fps_surf = self.debug_font.render(f"FPS: {fps}  ±{self.timer.get_jitter():.2f}ms", True, fps_col)
             # Draw with a small black background for visibility
             bg_rect = fps_surf.get_rect(topleft=(5, 5))
             pygame.draw.rect(self.screen, (0,0,0), bg_rect.inflate(4, 4))
             self.screen.blit(fps_surf, (5, 5))
         # -------------------
-        pygame.display.flip()
+        if self.global_settings.get("show_profiler", False):
+            self.draw_profiler()
+        with prof.stage("flip"):
+            pygame.display.flip()
+
+    def draw_profiler(self):
+        stats = self.profiler.get_stats()
+        rows = [("ms", "p50", "p95", "p99")]
+        for name, vals in stats.items():
+            rows.append((name,) + tuple(f"{v:.2f}" for v in vals))
+
+        # Proportional font, so each column is right-aligned on its own
+        line_h = self.debug_font.get_linesize()
+        w = 250
+        x = cfg.SCREEN_WIDTH - w - 5
+        bg = pygame.Surface((w, line_h * len(rows) + 8), pygame.SRCALPHA)
+        bg.fill((0, 0, 0, 180))
+        self.screen.blit(bg, (x, 5))
+        over = stats["frame"][1] * 1e6 > self.profiler.budget_ns
+        for i, row in enumerate(rows):
+            # Frame row in yellow when its p95 is over budget
+            col = (255, 255, 0) if row[0] == "frame" and over else (200, 200, 200)
+            y = 9 + i * line_h
+            self.screen.blit(self.debug_font.render(row[0], True, col), (x + 6, y))
+            for c, txt in enumerate(row[1:]):
+                surf = self.debug_font.render(txt, True, col)
+                self.screen.blit(surf, (x + 130 + c * 55 - surf.get_width(), y))
 
     def flip_state(self):
         previous, next_state_name = self.state_name, self.state.next_state
@@ -139,4 +197,6 @@ class TosokuApp:
             
         # 2. Save to disk
         self.storage.save_global_settings(self.global_settings)
+        self.storage.close() # Waits for queued runs and saves, so nothing is lost on exit
+        self.profiler.close()
         pygame.quit(); sys.exit()
\ No newline at end of file
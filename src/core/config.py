@@ -9,6 +9,8 @@ CREDITS_URL = "https://raw.githubusercontent.com/spacefaringiyo/GameTSK/refs/hea
 LINKS_URL = "https://raw.githubusercontent.com/spacefaringiyo/GameTSK/refs/heads/main/links.json"
 SCENARIOS_OFFICIAL_URL = "https://raw.githubusercontent.com/spacefaringiyo/GameTSK/refs/heads/main/scenarios_official.json"
 SCENARIOS_COMMUNITY_URL = "https://raw.githubusercontent.com/spacefaringiyo/GameTSK/refs/heads/main/scenarios_community.json"
+# Incremental sync (manifest + packs, see src/engine/scenario_sync.py); falls back to the list above if missing
+SCENARIOS_COMMUNITY_MANIFEST_URL = "https://raw.githubusercontent.com/spacefaringiyo/GameTSK/refs/heads/main/community/manifest.json"
 
 def get_data_dir():
     """Finds the standard application data directory for the current OS."""
@@ -36,6 +38,12 @@ DATA_DIR = get_data_dir()
 STATS_FILE = str(DATA_DIR / "tosoku_stats.json")
 SETTINGS_FILE = str(DATA_DIR / "settings.json")
 DATA_FILE = str(DATA_DIR / "tosoku_data.json")
+TRACES_FILE = str(DATA_DIR / "traces.bin")
+TRACES_INDEX_FILE = str(DATA_DIR / "traces.idx")
+HITCH_LOG_FILE = str(DATA_DIR / "hitches.jsonl")
+RUNS_DB_FILE = str(DATA_DIR / "runs.db")
+HTTP_CACHE_DIR = str(DATA_DIR / "http_cache")
+SCENARIO_STORE_FILE = str(DATA_DIR / "scenario_store.json")
 
 # --- LEGACY SUPPORT (Move old files if they exist) ---
 # This looks in the folder where the EXE/Script is and moves them to the new home.
@@ -64,6 +72,7 @@ SCENARIOS_DIR = os.path.join(BASE_DIR, "scenarios")
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 900
 TARGET_FPS = 144
+PHYSICS_HZ = 1000 # Fixed simulation step rate (0 = one step per rendered frame)
 
 # Colors
 BG_COLOR = (20, 20, 20)
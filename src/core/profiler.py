@@ -0,0 +1,171 @@
+import time
+import array
+import math
+import gc
+import json
+import os
+import threading
+from datetime import datetime
+
+# How often the overlay numbers are recomputed (sorting every frame would show up in the profile)
+STATS_INTERVAL_NS = 250_000_000
+# Hitches are written out in batches so the log itself doesn't cause more of them
+FLUSH_INTERVAL_NS = 1_000_000_000
+MAX_LOG_BYTES = 1_000_000 # Rotated to <file>.1 past this size
+
+class _Stage:
+    """Context manager for one named stage. Reused every frame, no allocation per 'with'."""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit()
+        return False
+
+class FrameProfiler:
+    """
+    Times the stages of the main loop with perf_counter_ns.
+
+    Stages nest ('draw' -> 'graph'), and each one is charged only its own time, so the
+    numbers add up to the frame. Garbage collection is tracked as its own 'gc' stage
+    through gc.callbacks. Every stage keeps its per-frame time in a fixed ring buffer
+    for the p50/p95/p99 overlay. Frames that go over budget are appended to a JSONL log
+    along with the active state and the stage that took the longest.
+    """
+    def __init__(self, budget_ns, log_path=None, window=600):
+        self.budget_ns = budget_ns
+        self.log_path = log_path
+        self.window = window
+        self.buffers = {}  # name -> array('q') of per-frame ns
+        self.order = []    # Stage names in first-seen order (overlay rows)
+        self.stages = {}   # name -> reusable _Stage
+        self.frame_ns = array.array('q', [0] * window)
+        self.count = 0
+
+        # Current frame
+        self.current = {}  # name -> ns spent this frame (own time only)
+        self.stack = []    # [name, start_ns, child_ns]
+        self.frame_start = None
+        self.last_frame_ns = 0
+        self.gc_collections = 0
+
+        self.stats = {}
+        self.stats_at = 0
+        self.pending = []
+        self.flushed_at = time.perf_counter_ns()
+
+        self.stage("gc") # Registered up front: the callback must not grow the buffers mid-frame
+        self.main_thread = threading.get_ident()
+        gc.callbacks.append(self._on_gc)
+
+    def stage(self, name):
+        s = self.stages.get(name)
+        if s is None:
+            s = self.stages[name] = _Stage(self, name)
+            self.buffers[name] = array.array('q', [0] * self.window)
+            self.order.append(name)
+        return s
+
+    def _enter(self, name):
+        self.stack.append([name, time.perf_counter_ns(), 0])
+
+    def _exit(self):
+        name, start, child = self.stack.pop()
+        elapsed = time.perf_counter_ns() - start
+        self.current[name] = self.current.get(name, 0) + elapsed - child
+        if self.stack: self.stack[-1][2] += elapsed
+
+    def _on_gc(self, phase, info):
+        # Only collections inside a frame on the main thread; worker threads (online
+        # fetches) don't stall the frame
+        if self.frame_start is None or threading.get_ident() != self.main_thread: return
+        if phase == "start":
+            self.stage("gc")
+            self._enter("gc")
+        elif self.stack and self.stack[-1][0] == "gc":
+            self._exit()
+            self.gc_collections += 1
+
+    def begin_frame(self):
+        self.current.clear()
+        self.gc_collections = 0
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self, state_name):
+        """Closes the frame. Returns True if it went over budget."""
+        if self.frame_start is None: return False
+        now = time.perf_counter_ns()
+        total = now - self.frame_start
+        self.frame_start = None
+        self.last_frame_ns = total
+
+        i = self.count % self.window
+        self.frame_ns[i] = total
+        for name, buf in self.buffers.items():
+            buf[i] = self.current.get(name, 0)
+        self.count += 1
+
+        over = self.budget_ns and total > self.budget_ns
+        if over and self.log_path:
+            worst = max(self.current, key=self.current.get) if self.current else None
+            self.pending.append({
+                "time": datetime.now().isoformat(timespec="milliseconds"),
+                "state": state_name,
+                "frame_ms": round(total / 1e6, 3),
+                "budget_ms": round(self.budget_ns / 1e6, 3),
+                "stage": worst,
+                "stages": {k: round(v / 1e6, 3) for k, v in self.current.items() if v},
+                "gc_collections": self.gc_collections,
+            })
+        if self.pending and now - self.flushed_at > FLUSH_INTERVAL_NS:
+            self.flush()
+        return bool(over)
+
+    # --- Stats ---
+
+    @staticmethod
+    def percentile(sorted_vals, p):
+        """Nearest-rank percentile of an already sorted sequence."""
+        if not sorted_vals: return 0
+        k = max(0, min(len(sorted_vals), math.ceil(p / 100.0 * len(sorted_vals))) - 1)
+        return sorted_vals[k]
+
+    def get_stats(self):
+        """{name: (p50, p95, p99)} in milliseconds, 'frame' included. Cached for a short while."""
+        now = time.perf_counter_ns()
+        if self.stats and now - self.stats_at < STATS_INTERVAL_NS:
+            return self.stats
+        n = min(self.count, self.window)
+        stats = {}
+        for name in self.order + ["frame"]:
+            buf = self.frame_ns if name == "frame" else self.buffers[name]
+            vals = sorted(buf[:n]) if self.count <= self.window else sorted(buf)
+            stats[name] = tuple(self.percentile(vals, p) / 1e6 for p in (50, 95, 99))
+        self.stats = stats
+        self.stats_at = now
+        return stats
+
+    # --- Hitch log ---
+
+    def flush(self):
+        self.flushed_at = time.perf_counter_ns()
+        if not self.pending or not self.log_path: return
+        lines = "".join(json.dumps(rec) + "\n" for rec in self.pending)
+        self.pending = []
+        try:
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > MAX_LOG_BYTES:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, "a") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Hitch log error: {e}")
+
+    def close(self):
+        self.flush()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
@@ -0,0 +1,71 @@
+# Render quality levels, best first. Only what gets drawn changes here: physics,
+# scoring and the graph's time scale are the same at every level.
+QUALITY_LEVELS = [
+    # particles: live particle cap     band_fill: alpha fill under the target band (else outline only)
+    # line_width: speed line width     dim_alpha: result screen dims with an alpha overlay (else a flat fill)
+    {"name": "HIGH",    "particles": 5000, "band_fill": True,  "line_width": 2, "dim_alpha": True},
+    {"name": "MEDIUM",  "particles": 1500, "band_fill": True,  "line_width": 2, "dim_alpha": True},
+    {"name": "LOW",     "particles": 400,  "band_fill": False, "line_width": 1, "dim_alpha": True},
+    {"name": "MINIMAL", "particles": 100,  "band_fill": False, "line_width": 1, "dim_alpha": False},
+]
+QUALITY_NAMES = [lvl["name"] for lvl in QUALITY_LEVELS]
+
+class QualityGovernor:
+    """
+    Watches frame work time (from the profiler, so limiter sleep doesn't count) and
+    steps the quality level down when frames get close to the TARGET_FPS budget, and
+    back up once there has been plenty of headroom for a while.
+    With auto off it just holds the chosen level.
+    """
+    WINDOW = 90        # Frames per decision
+    DOWN_AT = 0.85     # p90 above this share of the budget -> one level down
+    UP_AT = 0.5        # p90 below this share for UP_WINDOWS windows in a row -> one level up
+    UP_WINDOWS = 4
+
+    def __init__(self, target_fps, level=0, auto=True):
+        self.budget_ns = int(1e9 / target_fps) if target_fps > 0 else 0
+        self.level = level
+        self.auto = auto
+        self.samples = []
+        self.calm_windows = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def name(self):
+        return QUALITY_NAMES[self.level]
+
+    def set_mode(self, value):
+        """'AUTO' or one of QUALITY_NAMES (as stored in the settings file)."""
+        self.auto = value not in QUALITY_NAMES
+        if not self.auto:
+            self.level = QUALITY_NAMES.index(value)
+        self.samples = []
+        self.calm_windows = 0
+
+    def observe(self, frame_ns):
+        """Feed one frame's work time. Returns True when the level changed."""
+        if not self.auto or not self.budget_ns: return False
+        self.samples.append(frame_ns)
+        if len(self.samples) < self.WINDOW: return False
+
+        self.samples.sort()
+        p90 = self.samples[int(len(self.samples) * 0.9)]
+        self.samples = []
+
+        if p90 > self.budget_ns * self.DOWN_AT:
+            self.calm_windows = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self.level += 1
+                return True
+        elif p90 < self.budget_ns * self.UP_AT:
+            self.calm_windows += 1
+            if self.calm_windows >= self.UP_WINDOWS and self.level > 0:
+                self.calm_windows = 0
+                self.level -= 1
+                return True
+        else:
+            self.calm_windows = 0
+        return False
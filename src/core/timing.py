@@ -0,0 +1,80 @@
+import time
+import array
+import math
+
+# How close to the deadline we stop sleeping and spin instead.
+# OS sleeps overshoot by ~0.5-1ms, which is most of a 144Hz frame budget.
+SPIN_NS = 1_000_000
+
+class FrameTimer:
+    """
+    Measures real frame time with perf_counter_ns (no millisecond rounding like Clock.tick).
+    Keeps the last 'window' frame times in a ring buffer for FPS and jitter readouts.
+    """
+    def __init__(self, window=240):
+        self.last_ns = None
+        self.dt_ns = 0
+        self.window = window
+        self.samples = array.array('q', [0] * window)
+        self.count = 0 # Total frames recorded (index = count % window)
+
+    def reset(self):
+        self.last_ns = None
+        self.dt_ns = 0
+        self.count = 0
+
+    def tick(self):
+        """Call once per frame. Returns dt in seconds (0.0 on the very first call)."""
+        now = time.perf_counter_ns()
+        if self.last_ns is None:
+            self.last_ns = now
+            return 0.0
+        self.dt_ns = now - self.last_ns
+        self.last_ns = now
+        self.samples[self.count % self.window] = self.dt_ns
+        self.count += 1
+        return self.dt_ns / 1e9
+
+    def _recent(self):
+        n = min(self.count, self.window)
+        return self.samples[:n] if self.count <= self.window else self.samples
+
+    def get_fps(self):
+        recent = self._recent()
+        if not recent: return 0.0
+        return 1e9 * len(recent) / sum(recent)
+
+    def get_jitter(self):
+        """Standard deviation of the recent frame times, in milliseconds."""
+        recent = self._recent()
+        if len(recent) < 2: return 0.0
+        mean = sum(recent) / len(recent)
+        var = sum((x - mean) ** 2 for x in recent) / (len(recent) - 1)
+        return math.sqrt(var) / 1e6
+
+class FrameLimiter:
+    """
+    Caps the frame rate against absolute perf_counter_ns deadlines.
+    Only decides *when* the next frame starts; dt always comes from FrameTimer.
+    """
+    def __init__(self, target_fps):
+        self.set_target(target_fps)
+
+    def set_target(self, target_fps):
+        self.period_ns = int(1e9 / target_fps) if target_fps > 0 else 0
+        self.next_ns = None
+
+    def wait(self):
+        if not self.period_ns: return
+        now = time.perf_counter_ns()
+
+        # First frame, or we fell more than a frame behind: don't try to catch up
+        if self.next_ns is None or now - self.next_ns > self.period_ns:
+            self.next_ns = now
+
+        remaining = self.next_ns - now
+        if remaining > SPIN_NS:
+            time.sleep((remaining - SPIN_NS) / 1e9)
+        while time.perf_counter_ns() < self.next_ns:
+            pass
+        self.next_ns += self.period_ns
@@ -2,25 +2,164 @@ import json
 import base64
 import zlib
 import hashlib
+import copy
+import math
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
 
 PROTOCOL_PREFIX = "TSK1:"
 
-def generate_hash(config_data):
-    """DNA Check: Hash ONLY physics. Metadata changes won't break PBs."""
-    physics_keys = ["smoothing", "zoom_scale", "start_speed", "end_speed", 
-                    "tolerance", "duration", "warmup_time", "directions", "timeline", "variant_id"]
-    
+PHYSICS_KEYS = ("smoothing", "zoom_scale", "start_speed", "end_speed",
+                "tolerance", "duration", "warmup_time", "directions", "timeline", "variant_id")
+NUMBER_KEYS = ("smoothing", "zoom_scale", "start_speed", "end_speed", "tolerance", "duration", "warmup_time")
+HASH_CACHE_SIZE = 4096
+
+def physics_of(config_data):
+    """The part of a config that decides how it plays (what the hash is taken of)."""
     clean = {}
-    for k in physics_keys:
+    for k in PHYSICS_KEYS:
         val = config_data.get(k)
         if val is None: continue
         # Ensure numbers are integers for 15.0 == 15 matching
         if isinstance(val, (int, float)): clean[k] = int(val)
         else: clean[k] = val
-            
-    s = json.dumps(clean, sort_keys=True)
+    return clean
+
+def _physics_hash(config_data):
+    s = json.dumps(physics_of(config_data), sort_keys=True)
     return hashlib.md5(s.encode('utf-8')).hexdigest()
 
+# Shared cache for plain dicts: id -> (dict, copy of its physics values, hash).
+# Holding the dict keeps its id from being reused; the values are compared on every
+# hit, so a dict edited in place gets a fresh hash.
+_hash_cache = OrderedDict()
+
+def generate_hash(config_data):
+    """DNA Check: Hash ONLY physics. Metadata changes won't break PBs."""
+    if isinstance(config_data, ScenarioConfig):
+        return config_data.hash
+
+    values = tuple(map(config_data.get, PHYSICS_KEYS))
+    key = id(config_data)
+    hit = _hash_cache.get(key)
+    if hit is not None and hit[0] is config_data and hit[1] == values:
+        _hash_cache.move_to_end(key)
+        return hit[2]
+
+    h = _physics_hash(config_data)
+    _hash_cache[key] = (config_data, copy.deepcopy(values), h)
+    if len(_hash_cache) > HASH_CACHE_SIZE:
+        _hash_cache.popitem(last=False)
+    return h
+
+def _is_number(v):
+    if isinstance(v, bool): return False
+    try:
+        return math.isfinite(float(v)) # Hand-edited files sometimes have "75"
+    except (TypeError, ValueError, OverflowError):
+        return False
+
+def _to_number(v):
+    """'75' -> 75, '0.5' -> 0.5, so the engine never sees a string. Numbers pass through."""
+    if isinstance(v, (int, float)): return v
+    n = float(v)
+    return int(n) if n.is_integer() else n
+
+def _check_directions(where, dirs):
+    if not isinstance(dirs, (list, tuple)) or len(dirs) != 4:
+        raise ValueError(f"{where}: directions must be 4 flags [Up, Down, Left, Right], got {dirs!r}")
+
+def _freeze(v):
+    if isinstance(v, dict): return MappingProxyType({k: _freeze(x) for k, x in v.items()})
+    if isinstance(v, (list, tuple)): return tuple(_freeze(x) for x in v)
+    return v
+
+def _thaw(v):
+    if isinstance(v, Mapping): return {k: _thaw(x) for k, x in v.items()}
+    if isinstance(v, tuple): return [_thaw(x) for x in v]
+    return v
+
+class ScenarioConfig(Mapping):
+    """
+    Read-only scenario config. Checked once when it's made, with the physics hash
+    computed once and kept; reads like the dict it came from (get, [], in, keys), so it
+    can go wherever a config dict goes. Lists come back as tuples, nested dicts as
+    read-only mappings, numeric strings as numbers. to_dict() gives a plain, editable copy.
+    Raises ValueError for a config that can't be played.
+    """
+    __slots__ = ("_data", "_physics", "hash")
+
+    def __init__(self, data):
+        if isinstance(data, ScenarioConfig):
+            object.__setattr__(self, "_data", data._data)
+            object.__setattr__(self, "_physics", data._physics)
+            object.__setattr__(self, "hash", data.hash)
+            return
+
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Scenario must be an object, got {type(data).__name__}")
+        for k in NUMBER_KEYS:
+            if k in data and not _is_number(data[k]):
+                raise ValueError(f"Scenario: {k} must be a number, got {data[k]!r}")
+        if "directions" in data:
+            _check_directions("Scenario", data["directions"])
+        if "timeline" in data:
+            if not isinstance(data["timeline"], (list, tuple)):
+                raise ValueError("Scenario: timeline must be a list of keyframes")
+            for i, kf in enumerate(data["timeline"]):
+                if not isinstance(kf, Mapping):
+                    raise ValueError(f"Scenario: keyframe {i} must be an object")
+                for k in ("time", "speed", "tolerance"):
+                    if k in kf and not _is_number(kf[k]):
+                        raise ValueError(f"Scenario: keyframe {i} {k} must be a number, got {kf[k]!r}")
+                if "directions" in kf:
+                    _check_directions(f"Scenario keyframe {i}", kf["directions"])
+
+        # Hash of the data as given, so it matches generate_hash of the original dict
+        object.__setattr__(self, "hash", _physics_hash(data))
+        object.__setattr__(self, "_physics", copy.deepcopy(physics_of(data)))
+
+        clean = dict(data)
+        for k in NUMBER_KEYS:
+            if k in clean: clean[k] = _to_number(clean[k])
+        if "timeline" in clean:
+            clean["timeline"] = [{k: _to_number(v) if k in ("time", "speed", "tolerance") else v
+                                  for k, v in kf.items()} for kf in clean["timeline"]]
+        object.__setattr__(self, "_data", _freeze(clean))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScenarioConfig is read-only (use to_dict() for an editable copy)")
+
+    def __delattr__(self, name):
+        raise AttributeError("ScenarioConfig is read-only")
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __hash__(self):
+        return hash(self.hash)
+
+    def __repr__(self):
+        return f"ScenarioConfig({self.to_dict()!r})"
+
+    def same_physics(self, config_data):
+        """True if a plain config dict plays the same (same hash), without hashing it."""
+        return physics_of(config_data) == self._physics
+
+    def to_dict(self):
+        return _thaw(self._data)
+
+    def copy(self):
+        """Same as dict.copy(): an editable plain dict."""
+        return self.to_dict()
+
 def encode_config(config_data):
     """Full Snapshot: Include Name, Author, Description, and Physics."""
     try:
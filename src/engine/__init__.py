@@ -0,0 +1 @@
+from src.engine.simulation import Simulation, simulate
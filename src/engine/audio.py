@@ -1,14 +1,192 @@
 import pygame
 import math
 import array
+import operator
+from collections import OrderedDict
+
+# Generated Sounds kept around per (waveform, freq), so dragging a slider back and forth
+# doesn't synthesize the same tone twice. 2 per setting, the rest are recent slider stops.
+SOUND_CACHE_SIZE = 24
+PULSE_DURATION = 0.1 # Seconds; a tick's pulse rings into the next ticks at rates above 10/s
+
+# Mixer buffer (samples). Smaller = hit feedback reaches the speakers sooner, but some
+# devices crackle or refuse it outright.
+AUDIO_BUFFER_SIZES = [128, 256, 512, 1024, 2048]
+DEFAULT_AUDIO_BUFFER = 512
+MIXER_FREQUENCY = 44100
+MIXER_CHANNELS = 1
+
+def init_mixer(buffer=DEFAULT_AUDIO_BUFFER, frequency=MIXER_FREQUENCY, channels=MIXER_CHANNELS):
+    """
+    (Re)opens the mixer with a 'buffer' sample buffer, stepping up through the larger
+    sizes if the device refuses it. Returns the buffer size that opened, or None if
+    there's no audio at all. Works with SDL_AUDIODRIVER=dummy.
+    """
+    if pygame.mixer.get_init():
+        pygame.mixer.quit()
+
+    sizes = [b for b in AUDIO_BUFFER_SIZES if b >= buffer] or [buffer]
+    for size in sizes:
+        try:
+            pygame.mixer.init(frequency, -16, channels, size)
+            return size
+        except pygame.error as e:
+            print(f"Mixer refused a {size} sample buffer: {e}")
+
+    # Last try: whatever the device likes (pygame's default buffer)
+    try:
+        pygame.mixer.init()
+        return DEFAULT_AUDIO_BUFFER
+    except pygame.error as e:
+        print(f"Audio disabled: {e}")
+        return None
+
+# Pitch follow streaming: chunk size bounds the latency (one playing + one queued)
+STREAM_CHUNK = 512 # Samples, ~11.6ms at 44.1 kHz; two cover a frame down to ~43 FPS
+STREAM_RING = 4    # Reused Sounds: playing, queued, and spare ones to write into
+PITCH_RANGE = 2.0  # Octaves at most either way; one octave per tolerance outside the zone
+
+class ToneStream:
+    """
+    A continuous tone whose pitch and volume can change every frame without clicks.
+    Short chunks are written into a small ring of reused Sounds (through their buffer,
+    no new Sound per chunk) and fed to a reserved channel with Channel.queue.
+    Phase carries over between chunks, and within a chunk the frequency and gain
+    glide linearly from the last values to the new ones, so buffer edges line up.
+    """
+    def __init__(self, engine, channel_id=1):
+        self.engine = engine
+        self.channel = pygame.mixer.Channel(channel_id)
+        frame_bytes = 2 * engine.channels
+        self.ring = [pygame.mixer.Sound(buffer=bytes(STREAM_CHUNK * frame_bytes)) for _ in range(STREAM_RING)]
+        self.views = [memoryview(s).cast('B') for s in self.ring]
+        self.next = 0
+        self.phase = 0.0 # Position in the sine table (cycles * sample rate)
+        self.freq = 0.0
+        self.gain = 0.0
+
+    def reset(self):
+        self.channel.stop()
+        self.gain = 0.0
+
+    def _render(self, freq, gain):
+        """Next chunk into the next ring slot. Returns that Sound."""
+        eng = self.engine
+        table = eng._sine_table()
+        sr = len(table)
+        n = STREAM_CHUNK
+        f0 = self.freq or freq
+        g0 = self.gain
+        # Phase of sample i with the frequency ramping f0 -> freq: p0 + f0*i + (freq-f0)*i^2/(2n)
+        p0, a, b = self.phase, f0, (freq - f0) / (2 * n)
+        dg = (gain - g0) / n
+        buf = array.array('h', [int(table[int(p0 + (a + b * i) * i) % sr] * (g0 + dg * i)) for i in range(n)])
+        self.phase = (p0 + (a + b * n) * n) % sr
+        self.freq, self.gain = freq, gain
+
+        slot = self.next
+        self.next = (slot + 1) % STREAM_RING
+        self.views[slot][:] = eng._to_mixer_channels(buf).tobytes()
+        return self.ring[slot]
+
+    def update(self, freq, gain):
+        ch = self.channel
+        if not ch.get_busy():
+            # First chunk, or the game loop stalled past both chunks: fade in from silence
+            self.gain = 0.0
+            ch.play(self._render(freq, gain))
+        if ch.get_queue() is None:
+            ch.queue(self._render(freq, gain))
+
+class TickScheduler:
+    """
+    Plays tick mode on the mixer's own timeline instead of the frame clock.
+    One reserved channel plays back-to-back segments, each exactly one tick interval of
+    samples long, so the spacing is sample accurate whatever the frame pacing is.
+    Each segment holds the start of this tick's pulse mixed with the tails of the
+    previous ticks still ringing, so overlapping pulses sound like they did before.
+
+    The game loop keeps one segment queued behind the playing one (Channel.queue).
+    When the status changes, the queued segment is swapped, so a change is heard at the
+    next tick boundary, within one interval.
+    """
+    def __init__(self, engine, channel_id=0):
+        self.engine = engine
+        self.channel = pygame.mixer.Channel(channel_id)
+        self.segments = {} # (kind, previous kinds...) -> Sound
+        self.waves = {}    # freq -> mono pulse samples
+        self.kinds = []    # Kind of every tick handed to the mixer, newest last
+        self.queued = None # Sound we queued that hasn't started yet
+
+    def invalidate(self):
+        """Settings changed: drop the baked segments (volume and frequency are in them)."""
+        self.segments = {}
+        self.waves = {}
+
+    def reset(self):
+        self.channel.stop()
+        self.kinds = []
+        self.queued = None
+
+    def _wave(self, kind):
+        eng = self.engine
+        freq = int(round(eng.hit_freq if kind == "hit" else eng.miss_freq))
+        wave = self.waves.get(freq)
+        if wave is None:
+            wave = self.waves[freq] = eng._make_pulse(freq)
+        return wave
+
+    def _segment(self, history):
+        """Sound for the newest tick in 'history' (oldest first) plus tails of the earlier ones."""
+        snd = self.segments.get(history)
+        if snd is not None: return snd
+
+        eng = self.engine
+        n = max(1, round(eng.sample_rate / eng.tick_rate))
+        mix = [0.0] * n
+        # history[-1] starts now, history[-2] started one interval ago, ...
+        for age, kind in enumerate(reversed(history)):
+            if kind is None: continue
+            vol = eng.hit_vol if kind == "hit" else eng.miss_vol
+            part = self._wave(kind)[age * n:(age + 1) * n]
+            for i, v in enumerate(part):
+                mix[i] += v * vol
+        buf = array.array('h', [max(-32768, min(32767, int(v))) for v in mix])
+        snd = self.segments[history] = pygame.mixer.Sound(buffer=eng._to_mixer_channels(buf))
+        return snd
+
+    def _depth(self):
+        """How many ticks (this one included) a pulse can still be heard in."""
+        n = self.engine.sample_rate / self.engine.tick_rate
+        return max(1, math.ceil(self.engine.sample_rate * PULSE_DURATION / n))
+
+    def _push(self, kind):
+        self.kinds.append(kind)
+        del self.kinds[:-self._depth()]
+        return self._segment(tuple(self.kinds))
+
+    def update(self, kind):
+        """kind: "hit", "miss" or None (silent tick) for the ticks from now on."""
+        ch = self.channel
+        if not ch.get_busy():
+            # Nothing playing (first tick, or we fell behind a whole segment): start now
+            self.kinds = []
+            self.queued = None
+            ch.play(self._push(kind))
+
+        pending = ch.get_queue()
+        if pending is not None and pending is self.queued:
+            # Next tick not started yet; swap it if the status moved on
+            if self.kinds[-1] != kind:
+                self.kinds.pop()
+                self.queued = self._push(kind)
+                ch.queue(self.queued)
+        else:
+            self.queued = self._push(kind)
+            ch.queue(self.queued)
 
 class AudioEngine:
-    def __init__(self):
-        if not pygame.mixer.get_init():
-            pygame.mixer.pre_init(44100, -16, 1, 512)
-        
-        self.sample_rate = 44100
-        
+    def __init__(self, buffer=DEFAULT_AUDIO_BUFFER):
         # State
         self.hit_enabled = True
         self.miss_enabled = False
@@ -19,60 +197,144 @@ class AudioEngine:
         
         # NEW: Tick Rate (0 = Continuous, >0 = Hz)
         self.tick_rate = 20
-        self.tick_timer = 0.0
+        # Pitch follow: one streamed tone whose pitch tracks the speed error (overrides tick rate)
+        self.pitch_follow = False
         
         # Sound Objects
         self.snd_hit_drone = None
         self.snd_miss_drone = None
-        self.snd_hit_pulse = None
-        self.snd_miss_pulse = None
         
         # Channels (for continuous drones)
         self.chn_hit = None
         self.chn_miss = None
         
+        self.ticks = None
+        self.start_mixer(buffer)
+
+    def start_mixer(self, buffer):
+        """
+        Opens (or reopens) the mixer with the requested buffer size. Every Sound belongs
+        to the mixer that made it, so the caches start over and the drones are rebuilt.
+        """
+        if self.ticks: self.stop_all()
+        self.requested_buffer = buffer
+        self.buffer = init_mixer(buffer)
+
+        init = pygame.mixer.get_init()
+        self.enabled = init is not None
+        self.sample_rate = init[0] if init else MIXER_FREQUENCY
+        self.sound_cache = OrderedDict()
+        self.sine_table = None
+        self.pulse_env = None
+        self.channels = init[2] if init else MIXER_CHANNELS
+        self.chn_hit = self.chn_miss = None
+        self.ticks = None
+        self.stream = None
+        if not self.enabled: return
+
         self.generate_sounds()
 
+        # Tick mode pulses and the pitch follow stream get reserved channels
+        pygame.mixer.set_reserved(2)
+        self.ticks = TickScheduler(self, 0)
+        self.stream = ToneStream(self, 1)
+
+    def get_latency_ms(self):
+        """
+        Buffer latency of the open mixer: buffer samples at the rate get_init() reports
+        (the device may have picked a different rate than we asked for). None without audio.
+        """
+        if not self.enabled or not self.buffer: return None
+        return self.buffer / self.sample_rate * 1000.0
+
     def generate_sounds(self):
-        # 1. Generate Continuous Drones (1 second loopable)
-        self.snd_hit_drone = self._make_sine(self.hit_freq, self.hit_vol)
-        self.snd_miss_drone = self._make_sine(self.miss_freq, self.miss_vol)
-        
-        # 2. Generate Discrete Pulses (0.1 second fade out)
-        self.snd_hit_pulse = self._make_pulse(self.hit_freq, self.hit_vol)
-        self.snd_miss_pulse = self._make_pulse(self.miss_freq, self.miss_vol)
-
-    def _make_sine(self, freq, volume):
-        """Continuous wave"""
-        n_samples = self.sample_rate
-        buf = array.array('h', [0] * n_samples)
-        amplitude = 32767 * volume
-        for i in range(n_samples):
-            val = math.sin(2 * math.pi * freq * (i / self.sample_rate))
-            buf[i] = int(val * amplitude)
-        return pygame.mixer.Sound(buffer=buf)
-
-    def _make_pulse(self, freq, volume):
+        """Picks the drone Sounds for the current frequencies (synthesized only on a cache miss)."""
+        # Continuous Drones (1 second loopable). Tick pulses are built by the TickScheduler.
+        self.snd_hit_drone = self._get_sound("sine", self.hit_freq)
+        self.snd_miss_drone = self._get_sound("sine", self.miss_freq)
+
+        # Same frequency on both sides would share one Sound, and with it one volume
+        if self.snd_miss_drone is self.snd_hit_drone:
+            self.snd_miss_drone = pygame.mixer.Sound(buffer=self.snd_hit_drone.get_raw())
+        self.apply_volumes()
+
+    def apply_volumes(self):
+        # Buffers are synthesized at full scale; loudness is the Sound's own volume
+        self.snd_hit_drone.set_volume(self.hit_vol)
+        self.snd_miss_drone.set_volume(self.miss_vol)
+
+    # --- Synthesis ---
+
+    def _get_sound(self, waveform, freq):
+        """LRU cache of Sounds keyed by (waveform, freq)."""
+        key = (waveform, int(round(freq)))
+        snd = self.sound_cache.get(key)
+        if snd is not None:
+            self.sound_cache.move_to_end(key)
+            return snd
+
+        buf = self._make_sine(key[1]) # The only cached waveform so far
+        snd = self.sound_cache[key] = pygame.mixer.Sound(buffer=self._to_mixer_channels(buf))
+        while len(self.sound_cache) > SOUND_CACHE_SIZE:
+            self.sound_cache.popitem(last=False)
+        return snd
+
+    def _sine_table(self):
+        """One full-scale cycle spread over a second of samples (built once per sample rate)."""
+        sr = self.sample_rate
+        if self.sine_table is None or len(self.sine_table) != sr:
+            step = 2 * math.pi / sr
+            self.sine_table = array.array('h', [int(math.sin(step * k) * 32767) for k in range(sr)])
+        return self.sine_table
+
+    def _sine_block(self, freq, n=None):
+        """
+        Full-scale samples of 'freq'. By default the shortest run that loops seamlessly,
+        sample rate / gcd(rate, freq): 150 Hz at 44.1 kHz is a 294 sample block, 151 Hz
+        the whole second. Integer frequencies land exactly on table entries, so each
+        cycle is one strided slice of the table (table[off::freq]), ~freq slices a second.
+        """
+        sr = self.sample_rate
+        table = self._sine_table()
+        if n is None: n = sr // math.gcd(sr, freq) if freq > 0 else 1
+        if freq <= 0: return array.array('h', bytes(2 * n))
+        out = array.array('h')
+        off = 0
+        while len(out) < n:
+            part = table[off::freq]
+            out += part
+            off = (off + len(part) * freq) % sr # Where the next cycle starts in the table
+        del out[n:]
+        return out
+
+    def _make_sine(self, freq):
+        """Continuous wave, 1 second: one block tiled with an array multiply"""
+        block = self._sine_block(freq)
+        buf = block * -(-self.sample_rate // len(block))
+        del buf[self.sample_rate:]
+        return buf
+
+    def _make_pulse(self, freq):
         """Short percussive sound (100ms)"""
-        duration = 0.1 
-        n_samples = int(self.sample_rate * duration)
-        buf = array.array('h', [0] * n_samples)
-        amplitude = 32767 * volume
-        
-        for i in range(n_samples):
-            # Envelope: Linear decay from 1.0 to 0.0
-            env = 1.0 - (i / n_samples)
-            val = math.sin(2 * math.pi * freq * (i / self.sample_rate))
-            buf[i] = int(val * amplitude * env)
-            
-        return pygame.mixer.Sound(buffer=buf)
-
-    def update_settings(self, hit_en, miss_en, hit_v, miss_v, hit_f, miss_f, tick_r):
-        regen = False
-        # If acoustic properties change, regenerate buffers
-        if (abs(self.hit_freq - hit_f) > 1 or abs(self.hit_vol - hit_v) > 0.01 or 
-            abs(self.miss_freq - miss_f) > 1 or abs(self.miss_vol - miss_v) > 0.01):
-            regen = True
+        n_samples = int(self.sample_rate * PULSE_DURATION)
+        wave = self._sine_block(freq, n_samples)
+        # Envelope: Linear decay from 1.0 to 0.0, built once per sample rate
+        if self.pulse_env is None or len(self.pulse_env) != n_samples:
+            self.pulse_env = array.array('d', [1.0 - i / n_samples for i in range(n_samples)])
+        return array.array('h', map(int, map(operator.mul, wave, self.pulse_env)))
+
+    def _to_mixer_channels(self, buf):
+        """Buffers are mono; a stereo (or wider) mixer wants every sample once per channel."""
+        channels = self.channels
+        if channels == 1: return buf
+        out = array.array('h', bytes(len(buf) * channels * buf.itemsize))
+        for c in range(channels):
+            out[c::channels] = buf
+        return out
+
+    def update_settings(self, hit_en, miss_en, hit_v, miss_v, hit_f, miss_f, tick_r, pitch_follow=False):
+        # Only a new frequency needs different buffers; volume is just set_volume
+        refreq = (abs(self.hit_freq - hit_f) > 1 or abs(self.miss_freq - miss_f) > 1)
             
         self.hit_enabled = hit_en
         self.miss_enabled = miss_en
@@ -81,18 +343,41 @@ class AudioEngine:
         self.hit_freq = hit_f
         self.miss_freq = miss_f
         self.tick_rate = tick_r
+        self.pitch_follow = pitch_follow
+        if not self.enabled: return
+        self.ticks.invalidate()
         
-        if regen:
+        if refreq:
             self.stop_all()
             self.generate_sounds()
+        else:
+            self.apply_volumes()
 
-    def update(self, dt, status):
+    def update(self, dt, status, error=0.0):
         """
         dt: delta time in seconds
         status: "PERFECT", "LOW", "HIGH"
+        error: signed distance outside the zone, in tolerances (0 inside; pitch follow only)
         """
+        if not self.enabled: return
+
+        # MODE C: PITCH FOLLOW (streamed tone, overrides drones and ticks)
+        if self.pitch_follow:
+            if self.chn_hit: self.chn_hit.stop(); self.chn_hit = None
+            if self.chn_miss: self.chn_miss.stop(); self.chn_miss = None
+            if self.ticks.channel.get_busy(): self.ticks.reset()
+
+            octaves = max(-PITCH_RANGE, min(PITCH_RANGE, error))
+            if status == "PERFECT": gain = self.hit_vol if self.hit_enabled else 0.0
+            else: gain = self.miss_vol if self.miss_enabled else 0.0
+            self.stream.update(self.hit_freq * 2 ** octaves, gain)
+            return
+        if self.stream.channel.get_busy(): self.stream.reset()
+
         # MODE A: CONTINUOUS DRONE (Tick Rate 0)
         if self.tick_rate == 0:
+            if self.ticks.channel.get_busy(): self.ticks.reset()
+
             # Hit Logic
             if status == "PERFECT" and self.hit_enabled:
                 if self.chn_hit is None or not self.chn_hit.get_busy():
@@ -114,18 +399,15 @@ class AudioEngine:
             if self.chn_hit: self.chn_hit.stop(); self.chn_hit = None
             if self.chn_miss: self.chn_miss.stop(); self.chn_miss = None
             
-            self.tick_timer += dt
-            interval = 1.0 / self.tick_rate
-            
-            if self.tick_timer >= interval:
-                self.tick_timer -= interval # Keep accumulated time for precision
-                
-                # Play Shot
-                if status == "PERFECT" and self.hit_enabled:
-                    self.snd_hit_pulse.play()
-                elif (status == "LOW" or status == "HIGH") and self.miss_enabled:
-                    self.snd_miss_pulse.play()
+            # Timing comes from the mixer; the frame only says what the next ticks are
+            kind = None
+            if status == "PERFECT" and self.hit_enabled: kind = "hit"
+            elif (status == "LOW" or status == "HIGH") and self.miss_enabled: kind = "miss"
+            self.ticks.update(kind)
 
     def stop_all(self):
+        if not self.enabled: return
         if self.chn_hit: self.chn_hit.stop()
-        if self.chn_miss: self.chn_miss.stop()
\ No newline at end of file
+        if self.chn_miss: self.chn_miss.stop()
+        self.ticks.reset()
+        self.stream.reset()
\ No newline at end of file
@@ -0,0 +1,93 @@
+import time
+import queue
+import threading
+import urllib.request
+import urllib.error
+import urllib.parse
+
+WORKERS = 3
+PER_HOST = 2     # Concurrent requests to one host (everything we fetch is on GitHub raw)
+TIMEOUT = 3      # Seconds per attempt
+RETRIES = 2      # Extra attempts after a network error or a 5xx
+BACKOFF = 0.5    # Seconds before the first retry, doubled for each one after
+
+class FetchService:
+    """
+    All network GETs go through here. A small pool of daemon workers does the
+    downloading, with a per-host limit, timeouts and retries with backoff; asking for a
+    URL that is already in flight just adds another callback to it.
+
+    Callbacks never run on a worker: finished requests wait in a queue until the main
+    loop calls dispatch() (once per frame), so states can write their attributes from a
+    callback without any locking. Each callback gets (result, error), one of them None.
+    """
+    def __init__(self, workers=WORKERS, per_host=PER_HOST):
+        self.per_host = per_host
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.waiting = {}   # key -> [callback, ...] (only touched on the main thread)
+        self.host_slots = {} # host -> BoundedSemaphore
+        self.host_lock = threading.Lock()
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"Fetch-{i}", daemon=True)
+            t.start()
+
+    def get(self, url, callback, cache=None, timeout=TIMEOUT, retries=RETRIES):
+        """
+        Queues a GET. Without a cache the result is the body (bytes); with an HttpCache
+        it is cache.fetch's (body, changed), i.e. a conditional request.
+        """
+        key = (url, cache is not None)
+        if key in self.waiting:
+            self.waiting[key].append(callback)
+            return
+        self.waiting[key] = [callback]
+        self.jobs.put((key, url, cache, timeout, retries))
+
+    def pending(self):
+        return len(self.waiting)
+
+    def dispatch(self):
+        """Main thread: runs the callbacks of everything that finished since last frame."""
+        while True:
+            try:
+                key, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return
+            for callback in self.waiting.pop(key, []):
+                try:
+                    callback(result, error)
+                except Exception as e:
+                    print(f"Fetch Callback Error ({key[0]}): {e}")
+
+    # --- Workers ---
+
+    def _slot(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self.host_lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+        return slot
+
+    def _worker(self):
+        while True:
+            key, url, cache, timeout, retries = self.jobs.get()
+            result = error = None
+            for attempt in range(retries + 1):
+                if attempt: time.sleep(BACKOFF * 2 ** (attempt - 1))
+                try:
+                    with self._slot(url):
+                        if cache is not None:
+                            result = cache.fetch(url, timeout=timeout)
+                        else:
+                            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                                result = resp.read()
+                    error = None
+                    break
+                except urllib.error.HTTPError as e:
+                    error = e
+                    if e.code < 500: break # 404 etc. won't fix themselves
+                except Exception as e: # URLError, timeouts, resets
+                    error = e
+            self.results.put((key, result, error))
\ No newline at end of file
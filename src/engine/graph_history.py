@@ -0,0 +1,73 @@
+import array
+
+# Small status codes instead of an RGB tuple per point (colors are the renderer's business)
+STATUS_NONE = 0
+STATUS_LOW = 1
+STATUS_HIGH = 2
+STATUS_PERFECT = 3
+STATUS_CODES = {"LOW": STATUS_LOW, "HIGH": STATUS_HIGH, "PERFECT": STATUS_PERFECT}
+
+class GraphHistory:
+    """
+    Preallocated ring buffer of graph points, one array per column.
+    Every value is written twice (at i and i + capacity), so the newest n points are
+    always one contiguous run and window() can hand out memoryviews without copying.
+    """
+    def __init__(self, capacity=1200):
+        self.resize(capacity)
+
+    def resize(self, capacity):
+        """Sets a new capacity (e.g. half the screen width). Drops the current points."""
+        self.capacity = max(2, int(capacity))
+        size = self.capacity * 2
+        self.speed = array.array('d', bytes(8 * size))
+        self.target = array.array('d', bytes(8 * size))
+        self.tolerance = array.array('d', bytes(8 * size))
+        self.status = array.array('b', bytes(size))
+        self.clear()
+
+    def clear(self):
+        self.head = 0   # Next write position (0..capacity-1)
+        self.length = 0
+        self.total = 0  # Points appended since the last clear (lets renderers see what's new)
+        self.generation = getattr(self, "generation", 0) + 1
+
+    def __len__(self):
+        return self.length
+
+    def append(self, speed, status, target, tolerance):
+        self.extend(1, speed, status, target, tolerance)
+
+    def extend(self, count, speed, status, target, tolerance):
+        """Appends the same point 'count' times (one frame spanning several graph steps)."""
+        cap = self.capacity
+        if count <= 0: return
+        self.total += count
+        count = min(count, cap)
+
+        # Split at the wrap, then write each run into both halves
+        first = min(count, cap - self.head)
+        for start, n in ((self.head, first), (0, count - first)):
+            if n <= 0: continue
+            for col, val in ((self.speed, speed), (self.target, target), (self.tolerance, tolerance), (self.status, status)):
+                run = array.array(col.typecode, [val]) * n
+                col[start:start + n] = run
+                col[start + cap:start + cap + n] = run
+
+        self.head = (self.head + count) % cap
+        self.length = min(cap, self.length + count)
+
+    def window(self, n=None):
+        """
+        Zero-copy views of the newest n points (oldest first):
+        (speed, status, target, tolerance) as memoryviews.
+        """
+        n = self.length if n is None else max(0, min(n, self.length))
+        end = self.head + self.capacity
+        start = end - n
+        return (memoryview(self.speed)[start:end], memoryview(self.status)[start:end],
+                memoryview(self.target)[start:end], memoryview(self.tolerance)[start:end])
+
+    def to_list(self):
+        """Plain (speed, status, target, tolerance) tuples, oldest first."""
+        return list(zip(*(v.tolist() for v in self.window())))
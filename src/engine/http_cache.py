@@ -0,0 +1,66 @@
+import os
+import json
+import time
+import hashlib
+import urllib.request
+import urllib.error
+
+class HttpCache:
+    """
+    On-disk cache for small GET downloads (the online scenario lists).
+    Keeps the body plus the ETag / Last-Modified the server sent and revalidates with a
+    conditional request, so an unchanged list costs a 304 and no body.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        base = os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest()[:20])
+        return base + ".body", base + ".meta"
+
+    def load(self, url):
+        """(body bytes, meta dict) of the cached copy, or (None, {})."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f: meta = json.load(f)
+            with open(body_path, 'rb') as f: body = f.read()
+        except (OSError, ValueError):
+            return None, {}
+        if meta.get("url") != url: return None, {}
+        return body, meta
+
+    def fetch(self, url, timeout=3):
+        """
+        Conditional GET. Returns (body, changed); changed is False when the server
+        answered 304 (or sent the same bytes) and the cached body is still current.
+        Network and HTTP errors are raised to the caller.
+        """
+        body, meta = self.load(url)
+        req = urllib.request.Request(url)
+        if body is not None:
+            if meta.get("etag"): req.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"): req.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                new_body = resp.read()
+                etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and body is not None:
+                return body, False
+            raise
+
+        self._store(url, new_body, etag, last_modified)
+        return new_body, new_body != body
+
+    def _store(self, url, body, etag, last_modified):
+        body_path, meta_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "fetched": time.time()}
+        try:
+            # Body first: a meta file never points at a body that isn't there yet
+            for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')):
+                with open(path + ".tmp", mode) as f: f.write(data)
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"HTTP Cache Write Error: {e}")
\ No newline at end of file
@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import threading
+
+DEBOUNCE = 0.5 # Seconds of quiet before a file is written; saves inside that window coalesce
+RETRY = 5.0    # Seconds before a failed write (disk full, locked file...) is tried again
+
+class JsonWriter:
+    """
+    Debounced, coalescing JSON saves on a background thread.
+
+    save(path, obj) only remembers the latest text for that path; the thread writes it
+    once nothing new has come in for DEBOUNCE seconds, so a burst of star toggles is one
+    write. Files are written compact to a temp file and swapped in with os.replace, so a
+    crash mid-write leaves the previous version instead of a truncated file.
+
+    The object is serialized in save(), on the caller's thread, so the writer only ever
+    handles immutable text and never races the main thread editing the dict. A write
+    that fails stays pending (unless a newer save replaced it) and is retried later.
+    """
+    def __init__(self, delay=DEBOUNCE, retry=RETRY):
+        self.delay = delay
+        self.retry = retry
+        self.pending = {} # path -> JSON text to write
+        self.last_save = 0.0
+        self.retry_at = 0.0 # Set after a failed write, delays the next round
+        self.rounds = 0     # Write rounds finished, so flush() knows its round is done
+        self.flush_requested = False
+        self.writing = False
+        self.closing = False
+        self.writes = 0   # Files actually written (for checks/benchmarks)
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="JsonWriter", daemon=True)
+        self.thread.start()
+
+    def save(self, path, obj):
+        try:
+            text = json.dumps(obj, separators=(",", ":"))
+        except (TypeError, ValueError, RuntimeError) as e:
+            print(f"Save Error ({os.path.basename(path)}): {e}")
+            return # Keep whatever was pending/on disk before
+        with self.cond:
+            self.pending[path] = text
+            self.last_save = time.monotonic()
+            self.cond.notify_all()
+
+    def flush(self):
+        """Writes everything pending now and waits until it's been tried (once)."""
+        with self.cond:
+            if not self.thread.is_alive():
+                jobs, self.pending = self.pending, {}
+            else:
+                self.flush_requested = True
+                self.cond.notify_all()
+                # A round already running may have started before the latest save
+                target = self.rounds + (2 if self.writing else 1)
+                while (self.pending or self.writing) and self.rounds < target:
+                    self.cond.wait()
+                return
+        for path, text in jobs.items():
+            if not self._write(path, text):
+                with self.cond: self.pending.setdefault(path, text)
+
+    def close(self):
+        self.flush()
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing:
+                    self.cond.wait()
+                if not self.pending: return # Closing, nothing left
+
+                # Debounce (and back off after a failure) unless someone is waiting on a flush
+                while not self.flush_requested and not self.closing:
+                    due = max(self.last_save + self.delay, self.retry_at)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0: break
+                    self.cond.wait(remaining)
+
+                jobs, self.pending = self.pending, {}
+                self.flush_requested = False
+                self.writing = True
+
+            failed = {path: text for path, text in jobs.items() if not self._write(path, text)}
+
+            with self.cond:
+                self.writing = False
+                self.writes += len(jobs) - len(failed)
+                self.rounds += 1
+                if failed and not self.closing:
+                    for path, text in failed.items():
+                        self.pending.setdefault(path, text) # A newer save wins
+                    self.retry_at = time.monotonic() + self.retry
+                self.cond.notify_all()
+
+    @staticmethod
+    def _write(path, text):
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            print(f"Save Error ({os.path.basename(path)}): {e}")
+            return False
\ No newline at end of file
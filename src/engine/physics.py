@@ -1,19 +1,88 @@
 import math
 import collections
+from src.engine.graph_history import GraphHistory
 # Removed: from src.core.config import TARGET_FPS 
 
+# We treat 144Hz as the reference reality for all physics/graphing.
+REFERENCE_FPS = 144.0
+
+class SpeedWindow:
+    """
+    Running (time, distance) totals over the newest samples that cover 'duration' seconds.
+    Same window as walking the history backwards until the time is covered, but every
+    sample is added once and dropped once, so a frame costs O(1) no matter the smoothing.
+    Time is kept in integer nanoseconds so adding/removing never drifts.
+    """
+    def __init__(self, duration=0.0, max_samples=1200):
+        self.duration = duration
+        self.duration_ns = round(duration * 1e9)
+        self.max_samples = max_samples
+        self.samples = collections.deque()
+        self.total_ns = 0
+        self.total_dist = 0.0
+
+    @property
+    def total_time(self):
+        return self.total_ns / 1e9
+
+    def clear(self):
+        self.samples.clear()
+        self.total_ns = 0
+        self.total_dist = 0.0
+
+    def push(self, dt, dist):
+        dt_ns = round(dt * 1e9)
+        self.samples.append((dt_ns, dist))
+        self.total_ns += dt_ns
+        self.total_dist += dist
+
+        # Drop the oldest sample while the newer ones still cover the window on their own
+        samples = self.samples
+        while len(samples) > 1 and (self.total_ns - samples[0][0] >= self.duration_ns or len(samples) > self.max_samples):
+            old_ns, old_dist = samples.popleft()
+            self.total_ns -= old_ns
+            self.total_dist -= old_dist
+
+        # Float distance can drift; resync whenever the window collapses to one sample
+        if len(samples) == 1:
+            self.total_dist = samples[0][1]
+
+    def rebuild(self, history, duration):
+        """Rescan 'history' (oldest first) when the window length changes mid-run."""
+        self.clear()
+        self.duration = duration
+        self.duration_ns = round(duration * 1e9)
+        for h_dt, h_dist in history:
+            self.push(h_dt, h_dist)
+
+def scan_speed(history, duration):
+    """
+    The old smoothing: walk the history (oldest first) backwards until 'duration' is
+    covered. Kept as the reference SpeedWindow is checked and benchmarked against.
+    """
+    total_time = 0.0
+    total_dist = 0.0
+    for h_dt, h_dist in reversed(history):
+        total_time += h_dt
+        total_dist += h_dist
+        if total_time >= duration:
+            break
+    return total_dist / total_time if total_time > 0.0001 else 0.0
+
 class Engine:
-    def __init__(self, max_history=1200):
+    def __init__(self, max_history=1200, graph_capacity=1200):
         # Increased buffer to handle high-fps inputs safely
         self.raw_history = collections.deque(maxlen=max_history)
-        self.graph_points = collections.deque(maxlen=1200) 
+        self.window = SpeedWindow(max_samples=max_history)
+        # Columnar ring buffer; the game sizes it to the visible half of the screen
+        self.graph_points = GraphHistory(graph_capacity)
         
         self.smoothing_window = 75
         
         # --- THE GOLDEN STANDARD ---
         # We treat 144Hz as the reference reality for all physics/graphing.
         # This prevents FPS manipulation from changing gameplay difficulty.
-        self.REFERENCE_FPS = 144.0 
+        self.REFERENCE_FPS = REFERENCE_FPS
         
         self.graph_accumulator = 0.0
         self.graph_step = 1.0 / self.REFERENCE_FPS 
@@ -24,6 +93,7 @@ class Engine:
 
     def reset_history(self):
         self.raw_history.clear()
+        self.window.clear()
 
     def process_frame(self, dx, dy, dt, target_speed, tolerance, directions):
         # 1. Filter Direction
@@ -43,14 +113,15 @@ class Engine:
         # Slider 15 always means ~0.1 seconds, regardless of computer speed.
         target_duration = self.smoothing_window / self.REFERENCE_FPS
         
-        total_time = 0.0
-        total_dist = 0.0
+        # Running totals instead of re-walking raw_history every frame.
+        # raw_history is only rescanned if the smoothing changes mid-run.
+        if target_duration != self.window.duration:
+            self.window.rebuild(self.raw_history, target_duration)
+        else:
+            self.window.push(dt, raw_dist)
         
-        for h_dt, h_dist in reversed(self.raw_history):
-            total_time += h_dt
-            total_dist += h_dist
-            if total_time >= target_duration:
-                break
+        total_time = self.window.total_time
+        total_dist = self.window.total_dist
         
         if total_time > 0.0001:
             smoothed_speed = total_dist / total_time
@@ -78,7 +149,7 @@ class Engine:
         progress = min(1.0, max(0.0, elapsed / duration))
         return start_val + (end_val - start_val) * progress
 
-    def record_graph_point(self, dt, speed, color, target, tolerance): 
+    def record_graph_point(self, dt, speed, status, target, tolerance): 
         self.graph_accumulator += dt
         
         loop_guard = 0
@@ -87,8 +158,10 @@ class Engine:
         # Accumulate points based on the REFERENCE step (1/144), not frame rate
         while self.graph_accumulator >= self.graph_step and loop_guard < MAX_LOOPS:
             self.graph_accumulator -= self.graph_step
-            self.graph_points.append((speed, color, target, tolerance))
             loop_guard += 1
+        
+        # One bulk write for every step this frame covered
+        self.graph_points.extend(loop_guard, speed, status, target, tolerance)
             
         if loop_guard >= MAX_LOOPS:
             self.graph_accumulator = 0.0
\ No newline at end of file
@@ -0,0 +1,63 @@
+import queue
+import threading
+from src.engine.runs import RunStore
+
+MAX_PENDING = 32 # Runs waiting to be written before submit() starts blocking
+
+class RunWriter:
+    """
+    Writes finished runs (input trace + history row) on a background thread, so the
+    frame a challenge ends never waits on the disk. Jobs go through a bounded queue;
+    flush() blocks until everything queued so far is on disk.
+
+    The thread opens its own RunStore connection (sqlite connections stay on the thread
+    that made them) and is the only user of the trace archive's write path.
+    """
+    def __init__(self, db_path, traces, on_saved=None, max_pending=MAX_PENDING):
+        self.db_path = db_path
+        self.traces = traces
+        self.on_saved = on_saved # Called on the writer thread with the new row id
+        self.queue = queue.Queue(max_pending)
+        self.thread = threading.Thread(target=self._run, name="RunWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, entry, trace=None, sensitivity=100):
+        """Queues one run. The entry must not be touched by the caller afterwards."""
+        self.queue.put((entry, trace, sensitivity))
+
+    def flush(self):
+        if self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Writes everything still queued, then stops the thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def _run(self):
+        runs = None
+        try:
+            runs = RunStore(self.db_path)
+        except Exception as e:
+            print(f"Run Writer Error: {e}")
+
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None: break
+                if runs is not None: self._write(runs, *job)
+            except Exception as e:
+                print(f"Run Writer Error: {e}")
+            finally:
+                self.queue.task_done()
+
+        if runs is not None: runs.close()
+
+    def _write(self, runs, entry, trace, sensitivity):
+        # Keep the input that produced this score (replays / offline analysis)
+        if trace is not None and entry.get("hash"):
+            trace_id = self.traces.append(entry["hash"], trace, sensitivity)
+            if trace_id is not None: entry["trace_id"] = trace_id
+        run_id = runs.add(entry)
+        if self.on_saved: self.on_saved(run_id)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import os
+import json
+import sqlite3
+
+# --- SCHEMA ---
+# One row per finished run. The columns the game reads are real columns (hash and date
+# are indexed); anything else a run entry carries goes into 'extra' as JSON, so new
+# fields don't need a migration.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    date     TEXT NOT NULL DEFAULT '',
+    config   TEXT NOT NULL DEFAULT '',
+    target   TEXT NOT NULL DEFAULT '',
+    score    REAL NOT NULL DEFAULT 0,
+    hash     TEXT,
+    trace_id INTEGER,
+    extra    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_hash_score ON runs(hash, score DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(date DESC, id DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+COLUMNS = ("date", "config", "target", "score", "hash", "trace_id")
+
+class RunStore:
+    """
+    Run history in SQLite (stdlib sqlite3). Inserts are one row each, nothing is ever
+    truncated, and the PB lookup is an index seek on (hash, score) instead of a scan of
+    the whole history.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.row_factory = sqlite3.Row
+        try:
+            # WAL + NORMAL: a commit is an append to the log, not a full fsync'd rewrite
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError as e:
+            print(f"Run DB Pragma Error: {e}")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    # --- Rows ---
+
+    @staticmethod
+    def _to_row(entry):
+        extra = {k: v for k, v in entry.items() if k not in COLUMNS}
+        return (str(entry.get("date", "")), str(entry.get("config", "")), str(entry.get("target", "")),
+                float(entry.get("score", 0) or 0), entry.get("hash"), entry.get("trace_id"),
+                json.dumps(extra) if extra else None)
+
+    @staticmethod
+    def _to_entry(row):
+        """Back to the same dict shape the JSON history used."""
+        entry = {"date": row["date"], "config": row["config"], "target": row["target"], "score": row["score"]}
+        if row["hash"] is not None: entry["hash"] = row["hash"]
+        if row["trace_id"] is not None: entry["trace_id"] = row["trace_id"]
+        if row["extra"]:
+            try: entry.update(json.loads(row["extra"]))
+            except ValueError: pass
+        entry["id"] = row["id"]
+        return entry
+
+    def add(self, entry):
+        """Inserts one run. Returns its row id."""
+        cur = self.db.execute("INSERT INTO runs (date, config, target, score, hash, trace_id, extra) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?)", self._to_row(entry))
+        self.db.commit()
+        return cur.lastrowid
+
+    # --- Queries ---
+
+    def recent(self, limit=20, offset=0, config_hash=None):
+        """Newest first. With config_hash, only that scenario's runs."""
+        if config_hash is None:
+            rows = self.db.execute("SELECT * FROM runs ORDER BY date DESC, id DESC LIMIT ? OFFSET ?",
+                                   (limit, offset))
+        else:
+            rows = self.db.execute("SELECT * FROM runs WHERE hash = ? ORDER BY date DESC, id DESC LIMIT ? OFFSET ?",
+                                   (config_hash, limit, offset))
+        return [self._to_entry(r) for r in rows]
+
+    def count(self, config_hash=None):
+        if config_hash is None:
+            return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM runs WHERE hash = ?", (config_hash,)).fetchone()[0]
+
+    def high_score(self, config_hash):
+        row = self.db.execute("SELECT MAX(score) FROM runs WHERE hash = ?", (config_hash,)).fetchone()
+        return row[0] if row and row[0] is not None else 0.0
+
+    def high_scores(self):
+        """{hash: best score} for every scenario that has runs."""
+        rows = self.db.execute("SELECT hash, MAX(score) FROM runs WHERE hash IS NOT NULL GROUP BY hash")
+        return {h: s for h, s in rows}
+
+    # --- Migration ---
+
+    def migrate_json(self, json_path):
+        """
+        One-time import of the old tosoku_stats.json (newest first, max 100 runs).
+        Recorded in the meta table, so it never runs twice; the JSON file is left alone.
+        """
+        done = self.db.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done: return 0
+
+        history = []
+        if os.path.exists(json_path):
+            try:
+                with open(json_path, 'r') as f: history = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Run Migration Error: {e}")
+                return 0
+        if not isinstance(history, list): history = []
+
+        # Oldest first, so row ids keep the original order
+        rows = [self._to_row(e) for e in reversed(history) if isinstance(e, dict)]
+        with self.db:
+            self.db.executemany("INSERT INTO runs (date, config, target, score, hash, trace_id, extra) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(len(rows)),))
+        if rows: print(f"Migrated {len(rows)} runs from {os.path.basename(json_path)}")
+        return len(rows)
@@ -1,4 +1,5 @@
 import math
+import bisect
 
 class Keyframe:
     def __init__(self, time, speed, tolerance, directions):
@@ -7,58 +8,112 @@ class Keyframe:
         self.tolerance = tolerance
         self.directions = directions # [Up, Down, Left, Right]
 
+def scan_state(keyframes, duration, t):
+    """
+    The old get_state_at: a linear walk over keyframes (sorted by time, stable). Kept
+    as the reference the compiled timeline is checked against.
+    """
+    t = max(0, min(t, duration))
+    prev_kf = keyframes[0]
+    next_kf = keyframes[-1]
+    for kf in keyframes:
+        if kf.time > t:
+            next_kf = kf
+            break
+        prev_kf = kf
+
+    if prev_kf is next_kf or next_kf.time - prev_kf.time <= 0:
+        return prev_kf.speed, prev_kf.tolerance, prev_kf.directions
+    progress = (t - prev_kf.time) / (next_kf.time - prev_kf.time)
+    current_speed = prev_kf.speed + (next_kf.speed - prev_kf.speed) * progress
+    current_tol = prev_kf.tolerance + (next_kf.tolerance - prev_kf.tolerance) * progress
+    return current_speed, current_tol, prev_kf.directions
+
 class Scenario:
     def __init__(self, duration):
         self.duration = duration
         self.keyframes = []
+        
+        # Compiled timeline: parallel lists sorted by time (rebuilt by compile())
+        self.times = []
+        self.speeds = []
+        self.tolerances = []
+        self.directions = []
+        self.compiled = False
+        self.cursor = 0 # Last lookup position; time usually only moves forward
     
     def add_keyframe(self, time, speed, tolerance, directions):
         kf = Keyframe(time, speed, tolerance, directions)
-        self.keyframes.append(kf)
-        # Ensure they are always sorted by time
-        self.keyframes.sort(key=lambda k: k.time)
+        # Keep sorted by time (after any equal times, like the old stable re-sort)
+        bisect.insort_right(self.keyframes, kf, key=lambda k: k.time)
+        self.compiled = False
+
+    def compile(self):
+        """Flattens the keyframes into parallel lists for fast lookups."""
+        self.times = [kf.time for kf in self.keyframes]
+        self.speeds = [kf.speed for kf in self.keyframes]
+        self.tolerances = [kf.tolerance for kf in self.keyframes]
+        self.directions = [kf.directions for kf in self.keyframes]
+        self.cursor = 0
+        self.compiled = True
+
+    def _find(self, t):
+        """Number of keyframes with time <= t (same as bisect_right on the times)."""
+        times = self.times
+        n = len(times)
+        i = self.cursor
+        # Fast path: same segment as last time, or the next one
+        if (i == 0 or times[i - 1] <= t) and (i == n or t < times[i]):
+            return i
+        if i < n and times[i] <= t and (i + 1 == n or t < times[i + 1]):
+            self.cursor = i + 1
+            return i + 1
+        self.cursor = bisect.bisect_right(times, t)
+        return self.cursor
 
     def get_state_at(self, t):
         """
         Returns (speed, tolerance, directions) for a specific time 't'.
         Interpolates speed between keyframes.
         """
+        if not self.compiled: self.compile()
+        
         # Clamp time
         t = max(0, min(t, self.duration))
         
         # 1. Find the two keyframes surrounding time 't'
-        # Since lists are small (usually < 50 items), a linear search is fast enough.
-        # We look for the first keyframe that is AFTER our current time.
-        
-        prev_kf = self.keyframes[0]
-        next_kf = self.keyframes[-1]
-        
-        for kf in self.keyframes:
-            if kf.time > t:
-                next_kf = kf
-                break
-            prev_kf = kf
+        # prev = last keyframe at or before t, next = first keyframe AFTER t.
+        # Before the first keyframe both are the first; past the last both are the last.
+        i = self._find(t)
+        if i == 0:
+            prev_i = next_i = 0
+        elif i == len(self.times):
+            prev_i = next_i = i - 1
+        else:
+            prev_i, next_i = i - 1, i
             
         # 2. Interpolate
-        if prev_kf == next_kf:
-            return prev_kf.speed, prev_kf.tolerance, prev_kf.directions
+        if prev_i == next_i:
+            return self.speeds[prev_i], self.tolerances[prev_i], self.directions[prev_i]
         
         # Calculate progress between prev and next (0.0 to 1.0)
-        segment_duration = next_kf.time - prev_kf.time
+        segment_duration = self.times[next_i] - self.times[prev_i]
         if segment_duration <= 0:
-            return prev_kf.speed, prev_kf.tolerance, prev_kf.directions
+            return self.speeds[prev_i], self.tolerances[prev_i], self.directions[prev_i]
             
-        progress = (t - prev_kf.time) / segment_duration
+        progress = (t - self.times[prev_i]) / segment_duration
         
         # Lerp Speed
-        current_speed = prev_kf.speed + (next_kf.speed - prev_kf.speed) * progress
+        prev_speed = self.speeds[prev_i]
+        current_speed = prev_speed + (self.speeds[next_i] - prev_speed) * progress
         
         # Lerp Tolerance (Optional, but looks nice)
-        current_tol = prev_kf.tolerance + (next_kf.tolerance - prev_kf.tolerance) * progress
+        prev_tol = self.tolerances[prev_i]
+        current_tol = prev_tol + (self.tolerances[next_i] - prev_tol) * progress
         
         # Directions: Use the previous keyframe's setting until we hit the next one
         # (Discrete change, no interpolation for booleans)
-        current_dirs = prev_kf.directions
+        current_dirs = self.directions[prev_i]
         
         return current_speed, current_tol, current_dirs
 
@@ -75,7 +130,9 @@ class Scenario:
                 # Update Default Tolerance (75)
                 tol = kf.get("tolerance", 75)
                 d = kf.get("directions", [True, True, True, True])
-                scen.add_keyframe(t, s, tol, d)
+                scen.keyframes.append(Keyframe(t, s, tol, d))
+            # One stable sort for the whole timeline instead of one per keyframe
+            scen.keyframes.sort(key=lambda k: k.time)
         else:
             start_v = float(data.get("start_speed", 500))
             end_v = float(data.get("end_speed", 500))
@@ -86,6 +143,7 @@ class Scenario:
             scen.add_keyframe(0.0, start_v, tol, dirs)
             scen.add_keyframe(dur, end_v, tol, dirs)
             
+        scen.compile()
         return scen
 
     @staticmethod
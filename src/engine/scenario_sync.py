@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import urllib.error
+import urllib.parse
+from src.core.utils import generate_hash
+
+MANIFEST_VERSION = 2
+PACK_PREFIX = 1 # Leading hash characters that pick a scenario's pack: 1 -> at most 16 packs
+
+# --- Format ---
+# Everything is a static file, so it can sit next to the old list on GitHub raw.
+#   manifest.json     {"version": 2, "packs": ["packs/<md5>.json", ...], "items": [[hash, pack index, digest], ...]}
+#   packs/<md5>.json  a plain scenario list, same shape as scenarios_community.json
+# 'items' is in display order, 'hash' is generate_hash of the scenario's physics and
+# 'digest' is item_digest of the whole entry, name included.
+# A scenario's pack is picked by the start of its hash, not its place in the list, so
+# adding, removing or moving scenarios only touches the packs those scenarios are in.
+# Pack names are the md5 of their bytes, so a published pack never changes. Clients
+# go by the digests: they only download packs holding a scenario they don't have, or
+# have with a different digest (renamed or edited).
+#
+# scenarios_community.json stays the one list people edit; community/ is generated from
+# it and never edited by hand. Publishing a change to the list is:
+#   python -m src.engine.scenario_sync          (rebuilds community/ from the list)
+#   python -m src.engine.scenario_sync --check  (exits 1 if community/ doesn't match it)
+# and committing both. Clients that find a manifest never read the plain list again, so
+# an out of date manifest would silently hide scenarios; run --check before pushing.
+
+COMMUNITY_LIST = "scenarios_community.json"
+COMMUNITY_DIR = "community"
+
+def item_hash(item):
+    return generate_hash(item["data"] if "data" in item else item)
+
+def item_digest(item):
+    return hashlib.md5(json.dumps(item, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def stale_packs(out_dir, manifest):
+    """Files in out_dir/packs that the manifest doesn't list (left over from older builds)."""
+    pack_dir = os.path.join(out_dir, "packs")
+    if not os.path.isdir(pack_dir): return []
+    listed = set(manifest["packs"])
+    return sorted(name for name in (f"packs/{f}" for f in os.listdir(pack_dir)) if name not in listed)
+
+def build(items, out_dir, prefix=PACK_PREFIX):
+    """Publisher side: writes the packs and manifest.json for a scenario list. Returns the manifest."""
+    os.makedirs(os.path.join(out_dir, "packs"), exist_ok=True)
+
+    # Same physics twice would be the same scenario for PBs/stars anyway; first one wins
+    seen = set()
+    unique = []
+    for item in items:
+        h = item_hash(item)
+        if h in seen: continue
+        seen.add(h)
+        unique.append((h, item))
+
+    buckets = {}
+    for h, item in unique:
+        buckets.setdefault(h[:prefix], []).append((h, item))
+
+    manifest = {"version": MANIFEST_VERSION, "packs": [], "items": []}
+    pack_of = {}
+    for key in sorted(buckets):
+        raw = json.dumps([item for h, item in buckets[key]], separators=(",", ":")).encode()
+        name = f"packs/{hashlib.md5(raw).hexdigest()}.json"
+        with open(os.path.join(out_dir, name), 'wb') as f: f.write(raw)
+        for h, item in buckets[key]:
+            pack_of[h] = len(manifest["packs"])
+        manifest["packs"].append(name)
+    manifest["items"] = [[h, pack_of[h], item_digest(item)] for h, item in unique]
+
+    for name in stale_packs(out_dir, manifest):
+        os.remove(os.path.join(out_dir, name))
+    with open(os.path.join(out_dir, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    return manifest
+
+def check(items, out_dir, prefix=PACK_PREFIX):
+    """Publisher side: what in out_dir doesn't match build(items). Empty list if it's current."""
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = build(items, tmp, prefix)
+        for name in ["manifest.json"] + manifest["packs"]:
+            with open(os.path.join(tmp, name), 'r') as f: expected = json.load(f)
+            try:
+                with open(os.path.join(out_dir, name), 'r') as f: published = json.load(f)
+            except (OSError, ValueError):
+                problems.append(f"{name} is missing or unreadable")
+                continue
+            if published != expected:
+                problems.append(f"{name} doesn't match the list")
+    problems.extend(f"{name} is no longer listed" for name in stale_packs(out_dir, manifest))
+    return problems
+
+class ScenarioSync:
+    """
+    Client side. Keeps every scenario it has seen in a local store (hash -> item and its
+    digest) and, on sync(), fetches the manifest as a conditional request.
+    An unchanged manifest is a 304 and nothing else; a changed one only pulls the packs
+    holding scenarios the store doesn't have yet, or has with another digest.
+
+    All callbacks arrive through the FetchService dispatch, i.e. on the main thread.
+    """
+    def __init__(self, manifest_url, store_path, fetcher, http_cache, json_writer, on_change=None):
+        self.manifest_url = manifest_url
+        self.store_path = store_path
+        self.fetcher = fetcher
+        self.http_cache = http_cache
+        self.json_writer = json_writer
+        self.on_change = on_change
+
+        self.items = None         # Display list, None until there is a complete one
+        self.complete = False     # items matches the cached manifest
+        self.loading = False
+        self.failed = False
+        self.unsupported = False  # Server has no manifest (404): caller should use the plain list
+        self.checked = 0.0
+        self.pending_packs = set()
+        self.pack_failed = False
+
+        self.store = self.load_store()
+        # Stale-while-revalidate: last manifest we got plus the store, no network needed
+        body, _ = http_cache.load(manifest_url)
+        manifest = self.parse_manifest(body)
+        if manifest is not None and not self.missing_packs(manifest):
+            self.items = self.assemble(manifest)
+            self.complete = True
+
+    # --- Local store ---
+
+    def load_store(self):
+        if not os.path.exists(self.store_path): return {}
+        try:
+            with open(self.store_path, 'r') as f: store = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Scenario Store Error: {e}")
+            return {}
+        return store if isinstance(store, dict) else {}
+
+    @staticmethod
+    def parse_manifest(body):
+        if body is None: return None
+        try:
+            manifest = json.loads(body.decode())
+            if manifest.get("version") != MANIFEST_VERSION: return None
+            packs, items = manifest["packs"], manifest["items"]
+            if not all(0 <= idx < len(packs) for h, idx, digest in items): return None
+            return manifest
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Manifest Error: {e}")
+            return None
+
+    def missing_packs(self, manifest):
+        """Indices of the packs we still need (scenario not in the store, or stored with another digest)."""
+        needed = set()
+        for h, idx, digest in manifest["items"]:
+            have = self.store.get(h)
+            if have is None or have.get("digest") != digest:
+                needed.add(idx)
+        return needed
+
+    def assemble(self, manifest):
+        return [self.store[h]["item"] for h, idx, digest in manifest["items"] if h in self.store]
+
+    # --- Sync ---
+
+    def sync(self):
+        if self.loading: return
+        self.loading = True
+        self.fetcher.get(self.manifest_url, self._on_manifest, cache=self.http_cache)
+
+    def _on_manifest(self, result, error):
+        if error is not None:
+            if isinstance(error, urllib.error.HTTPError) and error.code == 404:
+                self.unsupported = True
+            else:
+                print(f"Manifest Fetch Error: {error}")
+            self._done(failed=True)
+            return
+
+        body, changed = result
+        if not changed and self.complete:
+            self._done(failed=False) # The one tiny request
+            return
+
+        manifest = self.parse_manifest(body)
+        if manifest is None:
+            self._done(failed=True)
+            return
+
+        needed = self.missing_packs(manifest)
+        if not needed:
+            self._finish(manifest)
+            return
+        self.pending_packs = set(needed)
+        self.pack_failed = False
+        for idx in needed:
+            url = urllib.parse.urljoin(self.manifest_url, manifest["packs"][idx])
+            self.fetcher.get(url, lambda r, e, idx=idx: self._on_pack(manifest, idx, r, e))
+
+    def _on_pack(self, manifest, idx, body, error):
+        name = manifest["packs"][idx]
+        wanted = {h: digest for h, i, digest in manifest["items"] if i == idx}
+        try:
+            if error is not None: raise error
+            pack = json.loads(body.decode())
+            for item in pack:
+                h, digest = item_hash(item), item_digest(item)
+                if wanted.get(h) == digest: # Anything the manifest doesn't list for this pack is ignored
+                    self.store[h] = {"digest": digest, "item": item}
+        except Exception as e:
+            print(f"Pack Fetch Error ({name}): {e}")
+            self.pack_failed = True
+
+        self.pending_packs.discard(idx)
+        if not self.pending_packs:
+            self._finish(manifest)
+
+    def _finish(self, manifest):
+        # Drop what the library no longer has, then persist through the debounced writer
+        listed = {h for h, idx, digest in manifest["items"]}
+        for h in [h for h in self.store if h not in listed]:
+            del self.store[h]
+        self.json_writer.save(self.store_path, self.store)
+
+        self.items = self.assemble(manifest)
+        self.complete = not self.missing_packs(manifest)
+        self._done(failed=not self.complete)
+        if self.on_change: self.on_change()
+
+    def _done(self, failed):
+        self.failed = failed
+        self.loading = False
+        self.checked = time.monotonic()
+        if failed and self.items is None and self.on_change: self.on_change()
+
+if __name__ == "__main__":
+    # From the repo root: python -m src.engine.scenario_sync [--check] [list.json] [out dir] [hash prefix]
+    args = [a for a in sys.argv[1:] if a != "--check"]
+    list_path = args[0] if len(args) > 0 else COMMUNITY_LIST
+    out_dir = args[1] if len(args) > 1 else COMMUNITY_DIR
+    prefix = int(args[2]) if len(args) > 2 else PACK_PREFIX
+    with open(list_path, 'r', encoding='utf-8') as f: scenarios = json.load(f)
+
+    if "--check" in sys.argv:
+        problems = check(scenarios, out_dir, prefix)
+        for problem in problems: print(f"{out_dir}/{problem}")
+        if problems:
+            print(f"Out of date: run python -m src.engine.scenario_sync and commit {out_dir}/")
+            sys.exit(1)
+        print(f"{out_dir}/ matches {list_path}")
+    else:
+        m = build(scenarios, out_dir, prefix)
+        print(f"{len(m['items'])} scenarios in {len(m['packs'])} packs -> {out_dir}")
\ No newline at end of file
@@ -0,0 +1,183 @@
+import array
+from src.core.config import PHYSICS_HZ
+from src.engine.physics import Engine, REFERENCE_FPS
+from src.engine.graph_history import STATUS_CODES, STATUS_NONE
+from src.engine.scenario import Scenario
+from src.engine.traces import TraceArchive
+
+# Frame time limits (seconds). Long hitches are capped so one stall can't dump a
+# huge chunk of time into the score. There is no real lower bound any more: dt comes
+# from perf_counter_ns, so sub-millisecond frames (1000+ FPS) are reported as they are.
+MIN_DT = 0.0
+MAX_DT = 0.1
+
+def clamp_dt(dt):
+    if dt > MAX_DT: dt = MAX_DT
+    if dt < MIN_DT: dt = MIN_DT
+    return dt
+
+class Simulation:
+    """
+    The scoring core of a run, with no pygame in sight.
+    Feed it (dt, dx, dy) samples and it keeps the timer, time in zone, score and graph.
+    GameState drives one of these live; 'simulate' drives one from a recorded stream.
+
+    With physics_hz > 0 (the default) the physics runs in fixed steps: frame time goes
+    into an accumulator and each frame's mouse motion is spread evenly over the time it
+    covers, so the score doesn't depend on the frame rate. physics_hz=0 is the old
+    one-physics-step-per-frame mode.
+    """
+    def __init__(self, config, mode="CHALLENGE", sensitivity=100, record=False, physics_hz=PHYSICS_HZ, graph_capacity=1200):
+        self.config = config
+        self.mode = mode
+        self.sensitivity = sensitivity
+        self.multiplier = sensitivity / 100.0
+        self.record = record
+        self.physics_hz = physics_hz
+        self.step_ns = round(1e9 / physics_hz) if physics_hz else 0
+        self.step_dt = self.step_ns / 1e9
+
+        self.scenario = Scenario.from_config(config)
+        self.duration = self.scenario.duration
+
+        # The smoothing window has to fit in the history at the fixed step rate
+        smoothing = config.get("smoothing", 75)
+        history = 1200
+        if physics_hz:
+            history = max(history, int(smoothing / REFERENCE_FPS * physics_hz) + 2)
+        self.engine = Engine(max_history=history, graph_capacity=graph_capacity)
+        self.engine.smoothing_window = smoothing
+        self.reset()
+
+    def reset(self):
+        self.timer = 0.0
+        self.score = 0.0
+        self.time_in_zone = 0.0
+        self.finished = False
+
+        # Last processed frame (for HUD/audio)
+        self.speed = 0.0
+        self.status = None
+        self.diff = 0
+        self.tolerance = 0
+        self.scoring = False
+
+        # Fixed step state: leftover time (ns) and the motion that belongs to it
+        self.acc_ns = 0
+        self.pending_dx = 0.0
+        self.pending_dy = 0.0
+        self.prev_timer = self.timer
+
+        # Raw (dt_ns, dx, dy) input, before clamping and sensitivity, for the trace archive
+        self.trace = array.array('i') if self.record else None
+
+        self.engine.reset_graph()
+        self.engine.reset_history()
+
+        if self.mode == "CHALLENGE":
+            self.timer = -float(self.config.get("warmup_time", 0))
+        self.prev_timer = self.timer
+
+    def step(self, dt, dx, dy):
+        """
+        Advance one frame. Returns the zone status of the latest physics step, or None
+        on the frame the challenge ends (and before the first fixed step has run).
+        """
+        # Only the run itself is recorded, not the result screen that follows it
+        if self.trace is not None and not self.finished:
+            self.trace.extend(TraceArchive.pack_sample(dt, dx, dy))
+
+        dt = clamp_dt(dt)
+        dx *= self.multiplier
+        dy *= self.multiplier
+
+        if not self.step_ns:
+            return self._tick(dt, dx, dy)
+
+        # --- FIXED STEP ---
+        self.acc_ns += round(dt * 1e9)
+        self.pending_dx += dx
+        self.pending_dy += dy
+
+        status = self.status
+        while self.acc_ns >= self.step_ns:
+            # This step gets its share of the motion still waiting to be simulated
+            share = self.step_ns / self.acc_ns
+            step_dx = self.pending_dx * share
+            step_dy = self.pending_dy * share
+            self.pending_dx -= step_dx
+            self.pending_dy -= step_dy
+            self.acc_ns -= self.step_ns
+
+            self.prev_timer = self.timer
+            status = self._tick(self.step_dt, step_dx, step_dy)
+            if status is None:
+                # Run ended mid-frame; whatever is left over belongs to the result screen
+                self.acc_ns = 0
+                self.pending_dx = self.pending_dy = 0.0
+                return None
+        return status
+
+    def _tick(self, dt, dx, dy):
+        """One physics step with already clamped dt and scaled motion."""
+        if self.mode == "CHALLENGE" and not self.finished:
+            self.timer += dt
+            if self.timer >= self.duration:
+                self.finish()
+                return None
+
+        sim_time = max(0.0, self.timer)
+        target_speed, target_tol, target_dirs = self.scenario.get_state_at(sim_time)
+        speed, status, diff = self.engine.process_frame(dx, dy, dt, target_speed, target_tol, target_dirs)
+
+        # Only the warmup and the live part of a challenge count towards the score
+        self.scoring = self.mode == "WARMUP" or (self.mode == "CHALLENGE" and self.timer >= 0 and not self.finished)
+        if self.scoring and status == "PERFECT":
+            self.time_in_zone += dt
+
+        code = STATUS_CODES.get(status, STATUS_NONE)
+        self.engine.record_graph_point(dt, speed, code, target_speed, target_tol)
+
+        self.speed, self.status, self.diff = speed, status, diff
+        self.tolerance = target_tol
+        return status
+
+    # --- Render interpolation ---
+
+    def get_alpha(self):
+        """How far (0..1) we are between the last two fixed steps."""
+        if not self.step_ns or self.finished: return 1.0
+        return self.acc_ns / self.step_ns
+
+    def get_render_timer(self):
+        alpha = self.get_alpha()
+        return self.prev_timer + (self.timer - self.prev_timer) * alpha
+
+    def finish(self):
+        self.finished = True
+        self.timer = self.duration
+        if self.duration > 0:
+            self.score = (self.time_in_zone / self.duration) * 100
+            if self.score > 100.0: self.score = 100.0
+
+    def run(self, samples):
+        """Feeds a whole (dt, dx, dy) stream until the challenge ends. Returns the status stream."""
+        statuses = []
+        for dt, dx, dy in samples:
+            if self.finished: break
+            status = self.step(dt, dx, dy)
+            if status is not None:
+                statuses.append(status)
+        return statuses
+
+def simulate(config, samples, mode="CHALLENGE", sensitivity=100, physics_hz=PHYSICS_HZ):
+    """
+    Offline scoring: returns (score, statuses, graph_points) for a recorded input stream.
+    graph_points are (speed, status_code, target, tolerance) tuples, oldest first.
+    If the stream ends before the timer does, the run is closed where the stream stops.
+    """
+    sim = Simulation(config, mode, sensitivity, physics_hz=physics_hz)
+    statuses = sim.run(samples)
+    if sim.mode == "CHALLENGE" and not sim.finished:
+        sim.finish()
+    return sim.score, statuses, sim.engine.graph_points.to_list()
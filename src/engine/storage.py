@@ -1,13 +1,45 @@
 import json
-import urllib.request
 import os
 import glob
+import time
 from src.core.utils import generate_hash, generate_auto_name
-from src.core.config import STATS_FILE, SETTINGS_FILE, DATA_FILE, SCENARIOS_DIR
+from src.core.config import STATS_FILE, SETTINGS_FILE, DATA_FILE, SCENARIOS_DIR, TRACES_FILE, TRACES_INDEX_FILE, RUNS_DB_FILE, HTTP_CACHE_DIR, SCENARIO_STORE_FILE
+import src.core.config as cfg # URLs read at call time
+from src.engine.traces import TraceArchive
+from src.engine.runs import RunStore
+from src.engine.run_writer import RunWriter
+from src.engine.json_writer import JsonWriter
+from src.engine.http_cache import HttpCache
+from src.engine.fetch import FetchService
+from src.engine.scenario_sync import ScenarioSync
+
+ONLINE_REFRESH = 300 # Seconds before a shown online list is revalidated again
+ONLINE_RETRY = 15    # ... or after a failed fetch
+ONLINE_LOADING_ROWS = [{"name": "⏳ Loading...", "data": {}}]
+ONLINE_FAILED_ROWS = [
+    {"name": "⚠ Connection Failed", "data": {}},
+    {"name": "Retry later...", "data": {}}
+]
 
 class Storage:
-    def __init__(self):
+    def __init__(self, fetcher=None):
+        self.json_writer = JsonWriter() # Library + settings saves, debounced and atomic
         self.data = self.load_data()
+        self.traces = TraceArchive(TRACES_FILE, TRACES_INDEX_FILE)
+        # Run history lives in SQLite now; the old JSON history is imported once
+        self.runs = RunStore(RUNS_DB_FILE)
+        self.runs.migrate_json(STATS_FILE)
+        self.pbs = None # hash -> best score, read from the run DB on first use
+        self.revision = 0 # Bumped on every saved run, so screens know their cached rows are stale
+        # Finished runs are written off the render thread
+        self.writer = RunWriter(RUNS_DB_FILE, self.traces, on_saved=self._on_run_saved)
+
+        # Online scenario lists: url -> {"items", "checked", "failed", "loading"}
+        self.fetcher = fetcher or FetchService() # Callbacks run from TosokuApp's dispatch()
+        self.http_cache = HttpCache(HTTP_CACHE_DIR)
+        self.online = {}
+        self.online_revision = 0 # Bumped when a background fetch brings a new list
+        self.community_sync = None # ScenarioSync, made when the tab is first opened
 
 
     def load_data(self):
@@ -55,13 +87,16 @@ class Storage:
                 for k, v in default_structure.items():
                     if k not in d: d[k] = v
                 return d
-        except:
+        except (OSError, ValueError) as e:
+            # Keep the unreadable file around instead of overwriting it on the next save
+            print(f"Data Load Error: {e}")
+            try: os.replace(DATA_FILE, DATA_FILE + ".corrupt")
+            except OSError: pass
             return default_structure
 
 
     def save_data(self):
-        with open(DATA_FILE, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        self.json_writer.save(DATA_FILE, self.data)
 
     # --- List Management ---
 
@@ -170,27 +205,47 @@ class Storage:
         except: return {}
 
     def save_global_settings(self, data):
-        with open(SETTINGS_FILE, 'w') as f: json.dump(data, f, indent=4)
+        self.json_writer.save(SETTINGS_FILE, data)
 
-    def load_stats(self):
-        if not os.path.exists(STATS_FILE): return []
-        try:
-            with open(STATS_FILE, 'r') as f: return json.load(f)
-        except: return []
+    def load_stats(self, limit=100, offset=0):
+        """Newest runs first (a page of the history, not the whole table)."""
+        return self.runs.recent(limit, offset)
+
+    def count_runs(self):
+        return self.runs.count()
+
+    def save_run(self, entry, trace=None, sensitivity=100):
+        """
+        Hands the run (and its input trace) to the background writer; no disk I/O here.
+        The PB index is updated right away, revision once the row is actually written.
+        """
+        config_hash = entry.get("hash")
+        if config_hash is not None:
+            pbs = self.get_pb_index()
+            pbs[config_hash] = max(pbs.get(config_hash, 0.0), entry.get("score", 0))
+        self.writer.submit(entry, trace, sensitivity)
 
-    def save_run(self, entry):
-        history = self.load_stats()
-        history.insert(0, entry)
-        history = history[:100]
-        with open(STATS_FILE, 'w') as f: json.dump(history, f, indent=4)
+    def _on_run_saved(self, run_id):
+        self.revision += 1 # Writer thread; only ever incremented there
+
+    def flush(self):
+        """Blocks until every queued run and pending JSON save is on disk."""
+        self.writer.flush()
+        self.json_writer.flush()
+
+    def close(self):
+        self.writer.close()
+        self.json_writer.close()
+        self.runs.close()
+
+    def get_pb_index(self):
+        """hash -> best score for every scenario with runs. Built once, then kept current by save_run."""
+        if self.pbs is None:
+            self.pbs = self.runs.high_scores()
+        return self.pbs
 
     def get_high_score(self, config_hash):
-        history = self.load_stats()
-        # Filter history for matches. Handle old records missing 'hash' safely.
-        scores = [e.get('score', 0) for e in history if e.get('hash') == config_hash]
-        if not scores:
-            return 0.0
-        return max(scores)
+        return self.get_pb_index().get(config_hash, 0.0)
 
     def get_custom_scenarios(self):
     #"""Scans the scenarios/ folder for .json files"""
@@ -222,20 +277,82 @@ class Storage:
     
     # Changed to accept target_url
     def get_online_scenarios(self, target_url):
+        """
+        Never blocks: returns what is known about the list right now (the cached copy,
+        a loading row or an error row) and revalidates it in the background.
+        online_revision goes up when the fetch brings something new.
+        """
         if not target_url:
             return [{"name": "⚠ No URL Configured", "data": {}}]
 
+        entry = self.online.get(target_url)
+        if entry is None:
+            # Stale-while-revalidate: the copy on disk shows right away
+            body, _ = self.http_cache.load(target_url)
+            entry = {"items": self._parse_online(body), "checked": 0.0, "failed": False, "loading": False}
+            self.online[target_url] = entry
+
+        wait = ONLINE_RETRY if entry["failed"] else ONLINE_REFRESH
+        if not entry["loading"] and time.monotonic() - entry["checked"] > wait:
+            self._fetch_online(target_url, entry)
+
+        if entry["items"] is not None:
+            return entry["items"]
+        return ONLINE_FAILED_ROWS if entry["failed"] else ONLINE_LOADING_ROWS
+
+    def get_community_scenarios(self):
+        """
+        Like get_online_scenarios, but through the manifest sync: only scenarios we
+        don't have yet are downloaded. Servers without a manifest get the plain list.
+        """
+        sync = self.community_sync
+        if sync is None:
+            sync = self.community_sync = ScenarioSync(cfg.SCENARIOS_COMMUNITY_MANIFEST_URL, SCENARIO_STORE_FILE,
+                                                      self.fetcher, self.http_cache, self.json_writer,
+                                                      on_change=self._on_online_change)
+        if sync.unsupported:
+            return self.get_online_scenarios(cfg.SCENARIOS_COMMUNITY_URL)
+
+        wait = ONLINE_RETRY if sync.failed else ONLINE_REFRESH
+        if not sync.loading and time.monotonic() - sync.checked > wait:
+            sync.sync()
+
+        if sync.items is not None:
+            return sync.items
+        return ONLINE_FAILED_ROWS if sync.failed else ONLINE_LOADING_ROWS
+
+    def _on_online_change(self):
+        self.online_revision += 1
+
+    @staticmethod
+    def _parse_online(body):
+        if body is None: return None
         try:
-            with urllib.request.urlopen(target_url, timeout=3) as url:
-                data = json.loads(url.read().decode())
-                return data
-                
-        except Exception as e:
-            print(f"Online Fetch Error: {e}")
-            return [
-                {"name": "⚠ Connection Failed", "data": {}},
-                {"name": "Retry later...", "data": {}}
-            ]
+            data = json.loads(body.decode())
+        except ValueError as e:
+            print(f"Online List Error: {e}")
+            return None
+        return data if isinstance(data, list) else None
+
+    def _fetch_online(self, target_url, entry):
+        entry["loading"] = True
+
+        def _done(result, error):
+            entry["checked"] = time.monotonic()
+            entry["loading"] = False
+            if error is not None:
+                print(f"Online Fetch Error: {error}")
+                entry["failed"] = True
+                if entry["items"] is None: self.online_revision += 1 # Loading row -> error row
+                return
+            body, changed = result
+            items = self._parse_online(body) if changed or entry["items"] is None else entry["items"]
+            entry["failed"] = items is None
+            if changed and items is not None:
+                entry["items"] = items
+                self.online_revision += 1
+
+        self.fetcher.get(target_url, _done, cache=self.http_cache)
         
     def toggle_star(self, tab_name, config_data):
         """Pins/Unpins an item in a specific tab"""
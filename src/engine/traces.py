@@ -0,0 +1,157 @@
+import os
+import sys
+import mmap
+import time
+import array
+import struct
+
+# --- FILE LAYOUT ---
+# traces.bin : raw input samples, appended run after run. Each sample is a fixed
+#              12 byte record of little-endian int32 (dt_ns, dx, dy). dt is the frame
+#              delta, so the timestamps are stored delta-encoded by construction.
+# traces.idx : one fixed 48 byte record per run:
+#              md5(16) | run_id(u64) | offset(u64) | samples(u32) | sensitivity(f32) | created(f64)
+# The index is written after the samples, so a crash can only leave unreferenced bytes
+# at the end of traces.bin; a half written index record is ignored on load.
+
+SAMPLE_FIELDS = 3
+SAMPLE_SIZE = 4 * SAMPLE_FIELDS
+INDEX_FORMAT = "<16sQQIfd"
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+MAX_DT_NS = 2**31 - 1
+
+class TraceEntry:
+    def __init__(self, config_hash, run_id, offset, count, sensitivity, created):
+        self.config_hash = config_hash
+        self.run_id = run_id
+        self.offset = offset
+        self.count = count
+        self.sensitivity = sensitivity
+        self.created = created
+
+class TraceArchive:
+    """
+    Append-only archive of per-run (dt, dx, dy) input traces.
+    Samples are read back through mmap, so old runs never have to be loaded into RAM.
+    """
+    def __init__(self, data_path, index_path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.entries = None # run_id -> TraceEntry, loaded lazily
+        self.by_hash = {}   # config hash -> [run_id, ...]
+        self._file = None
+        self._map = None
+
+    # --- Index ---
+
+    def load_index(self):
+        self.entries = {}
+        self.by_hash = {}
+        if not os.path.exists(self.index_path): return
+        try:
+            with open(self.index_path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Trace Index Error: {e}"); return
+
+        usable = len(raw) - (len(raw) % INDEX_SIZE)
+        for digest, run_id, offset, count, sens, created in struct.iter_unpack(INDEX_FORMAT, raw[:usable]):
+            self._add_entry(TraceEntry(digest.hex(), run_id, offset, count, sens, created))
+
+    def _add_entry(self, entry):
+        self.entries[entry.run_id] = entry
+        self.by_hash.setdefault(entry.config_hash, []).append(entry.run_id)
+
+    def _ensure_index(self):
+        if self.entries is None: self.load_index()
+
+    def runs_for(self, config_hash):
+        self._ensure_index()
+        return list(self.by_hash.get(config_hash, []))
+
+    def get_entry(self, run_id):
+        self._ensure_index()
+        return self.entries.get(run_id)
+
+    # --- Writing ---
+
+    @staticmethod
+    def pack_sample(dt, dx, dy):
+        """Turns one raw frame into the int32 triple stored on disk."""
+        return (min(MAX_DT_NS, max(0, round(dt * 1e9))), int(round(dx)), int(round(dy)))
+
+    def append(self, config_hash, samples, sensitivity=100):
+        """
+        samples: array('i') of packed (dt_ns, dx, dy) triples.
+        Returns the new run id, or None if the write failed.
+        """
+        self._ensure_index()
+        run_id = max(self.entries) + 1 if self.entries else 1
+        count = len(samples) // SAMPLE_FIELDS
+
+        buf = array.array('i', samples[:count * SAMPLE_FIELDS])
+        if sys.byteorder != "little": buf.byteswap()
+
+        self._close_map() # Don't grow the file underneath a live mapping (Windows)
+        try:
+            with open(self.data_path, 'ab') as f:
+                offset = f.tell()
+                f.write(buf.tobytes())
+            created = time.time()
+            with open(self.index_path, 'ab') as f:
+                f.write(struct.pack(INDEX_FORMAT, bytes.fromhex(config_hash), run_id, offset, count, sensitivity, created))
+        except OSError as e:
+            print(f"Trace Write Error: {e}"); return None
+
+        self._add_entry(TraceEntry(config_hash, run_id, offset, count, sensitivity, created))
+        return run_id
+
+    # --- Reading ---
+
+    def _close_map(self):
+        if self._map is not None:
+            # A view still held by a caller keeps the pages alive; it unmaps once dropped
+            try: self._map.close()
+            except BufferError: pass
+            self._map = None
+        if self._file is not None:
+            self._file.close(); self._file = None
+
+    def _mapping(self, needed_end):
+        if self._map is not None and len(self._map) >= needed_end:
+            return self._map
+        self._close_map()
+        if not os.path.exists(self.data_path) or os.path.getsize(self.data_path) < needed_end:
+            return None
+        self._file = open(self.data_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def view(self, run_id):
+        """
+        Zero-copy int32 view of a run's packed samples: [dt_ns, dx, dy, dt_ns, ...].
+        Release it (or drop it) before the archive is appended to again.
+        """
+        entry = self.get_entry(run_id)
+        if entry is None: return None
+        end = entry.offset + entry.count * SAMPLE_SIZE
+        mapped = self._mapping(end)
+        if mapped is None: return None
+        raw = memoryview(mapped)[entry.offset:end]
+        if sys.byteorder != "little":
+            swapped = array.array('i', raw.tobytes()); swapped.byteswap()
+            return memoryview(swapped)
+        return raw.cast('i')
+
+    def samples(self, run_id):
+        """Yields (dt, dx, dy) per frame, ready to feed into Simulation/simulate."""
+        view = self.view(run_id)
+        if view is None: return
+        try:
+            for i in range(0, len(view), SAMPLE_FIELDS):
+                yield view[i] / 1e9, view[i + 1], view[i + 2]
+        finally:
+            view.release()
+
+    def close(self):
+        self._close_map()
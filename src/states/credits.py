@@ -89,28 +89,23 @@ class CreditsState(BaseState):
             y += 30
 
     def fetch_testers(self):
-        import urllib.request
         import json
-        import threading
         
-        def _run():
-            try:
-                with urllib.request.urlopen(cfg.CREDITS_URL, timeout=3) as url:
-                    raw_data = url.read().decode()
-                    
-                    # 1. Try JSON format ["A", "B"]
-                    try:
-                        data = json.loads(raw_data)
-                    except json.JSONDecodeError:
-                        # 2. Fallback to Text format "A, B, C"
-                        data = [name.strip() for name in raw_data.split(',') if name.strip()]
-                        
-                    if isinstance(data, list) and data:
-                        self.testers = data
-            except Exception as e:
-                print(f"Credits Error: {e}")
+        def _done(body, error):
+            if error is not None:
+                print(f"Credits Error: {error}")
                 self.testers = ["(Fetch Failed)"]
+                return
+            raw_data = body.decode()
+            
+            # 1. Try JSON format ["A", "B"]
+            try:
+                data = json.loads(raw_data)
+            except json.JSONDecodeError:
+                # 2. Fallback to Text format "A, B, C"
+                data = [name.strip() for name in raw_data.split(',') if name.strip()]
+                
+            if isinstance(data, list) and data:
+                self.testers = data
 
-        t = threading.Thread(target=_run)
-        t.daemon = True
-        t.start()
\ No newline at end of file
+        self.app.fetcher.get(cfg.CREDITS_URL, _done)
\ No newline at end of file
@@ -3,7 +3,7 @@ import src.core.config as cfg
 from src.core.config import *
 from src.states.base import BaseState
 from src.ui.elements import Button, TabbedBrowser, Slider, NameModal, EditFavModal, PulseButton
-from src.core.utils import encode_config, decode_config
+from src.core.utils import encode_config, decode_config, ScenarioConfig
 
 class EditorState(BaseState):
     def __init__(self, app):
@@ -18,6 +18,7 @@ class EditorState(BaseState):
         self.current_config = {}
         self.current_name = "Default"   # Track Name
         self.current_origin = "IMPORT"  # Track Origin (ONLINE, LOCAL, IMPORT)
+        self.config_error = ""          # Why the selected scenario can't be played/edited
         
         self.modal = None
         
@@ -92,6 +93,7 @@ class EditorState(BaseState):
         """
         self.current_config = data.copy()
         self.current_origin = origin
+        self.config_error = ""
         
         # Clean up name (remove old prefixes if they exist in the string)
         if name:
@@ -107,6 +109,16 @@ class EditorState(BaseState):
     def get_config(self):
         return self.current_config
 
+    def check_config(self):
+        """False (and the reason on screen) if the current config would break Game/Workshop."""
+        try:
+            ScenarioConfig(self.current_config)
+        except ValueError as e:
+            self.config_error = str(e)
+            return False
+        self.config_error = ""
+        return True
+
     def reset_to_default(self):
         self.current_config = {
             "smoothing": 75, "zoom_scale": 2,
@@ -226,7 +238,7 @@ class EditorState(BaseState):
         if self.btn_challenge.handle_event(event) == "CHALLENGE":
             self.start_run("CHALLENGE")
 
-        if self.btn_edit.handle_event(event) == "EDIT":
+        if self.btn_edit.handle_event(event) == "EDIT" and self.check_config():
             self.next_state = "WORKSHOP"
             # PASS CONTEXT TO WORKSHOP
             self.persistent_data = {
@@ -249,6 +261,9 @@ class EditorState(BaseState):
             self.next_state = "CREDITS"; self.done = True
 
     def start_run(self, mode):
+        # A broken (hand-edited/online) scenario stays here with an error instead of crashing the run
+        if not self.check_config(): return
+
         # Save Sens
         self.app.storage.save_global_settings(self.app.global_settings)
         
@@ -317,6 +332,10 @@ class EditorState(BaseState):
         if desc:
             desc_surf = self.font.render(desc, True, TEXT_GRAY)
             screen.blit(desc_surf, (cfg.SCREEN_WIDTH//2 - desc_surf.get_width()//2, 500))
+
+        if self.config_error:
+            err_surf = self.font.render(f"⚠ {self.config_error}", True, COLOR_FAST)
+            screen.blit(err_surf, (cfg.SCREEN_WIDTH//2 - err_surf.get_width()//2, 535))
         
         # 6. Draw Modal Overlay
         if self.modal:
@@ -327,21 +346,14 @@ class EditorState(BaseState):
             self.btn_update.draw(screen, self.font)
 
     def check_for_updates(self):
-        import urllib.request
-        import threading
-        
-        def _fetch():
-            try:
-                with urllib.request.urlopen(cfg.VERSION_URL, timeout=3) as url:
-                    content = url.read().decode().strip()
-                    if content > cfg.GAME_VERSION:
-                        self.update_available = True
-                        self.update_url = "https://github.com/spacefaringiyo/GameTSK/releases"
-            except Exception: pass
-
-        t = threading.Thread(target=_fetch)
-        t.daemon = True
-        t.start()
+        def _done(body, error):
+            if error is not None: return
+            content = body.decode().strip()
+            if content > cfg.GAME_VERSION:
+                self.update_available = True
+                self.update_url = "https://github.com/spacefaringiyo/GameTSK/releases"
+
+        self.app.fetcher.get(cfg.VERSION_URL, _done)
 
     def startup(self, persistent):
         # 1. Check if Workshop sent us a new selection/save
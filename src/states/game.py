@@ -4,16 +4,18 @@ from datetime import datetime
 from src.states.base import BaseState
 import src.core.config as cfg
 from src.core.config import *
-from src.engine.physics import Engine
-from src.engine.scenario import Scenario
+from src.engine.simulation import Simulation, clamp_dt
 from src.vfx.particles import ParticleSystem # <--- Import
+from src.vfx.graph import BandCache, PastGraphLayer, BAND_FILL
+from src.core.utils import ScenarioConfig
 
 class GameState(BaseState):
     def __init__(self, app):
         super().__init__(app)
         self.font = pygame.font.SysFont(["segoe ui symbol", "arial", "sans-serif"], 20)
         self.font_big = pygame.font.SysFont(["segoe ui symbol", "arial", "sans-serif"], 60)
-        self.engine = Engine()
+        self.sim = Simulation({}, "WARMUP")
+        self.engine = self.sim.engine
         
         # --- PARTICLE SYSTEM SETUP ---
         # OPTIONS: "POPPER", "STARS", "FOUNTAIN"
@@ -21,23 +23,23 @@ class GameState(BaseState):
         self.particles = ParticleSystem(self.vfx_mode)
         # ----------------------------------
         
-        self.graph_surf = pygame.Surface((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.graph_surf = pygame.Surface((cfg.SCREEN_WIDTH - cfg.SCREEN_WIDTH // 2, cfg.SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.band = BandCache() # Future half of the graph, precomputed per scenario
+        self.past_layer = None  # Past half of the graph, scrolled instead of redrawn
+        self.dim_overlay = None # Result screen dimming, built once per resolution
         self.reset_state_vars()
 
     def reset_state_vars(self):
-        self.timer = 0.0
-        self.score = 0.0
-        self.time_in_zone = 0.0
-        self.run_finished = False
         self.is_pb = False
         self.cached_pb = 0.0
         # Clear particles when restarting run
-        self.particles.particles = []
+        self.particles.clear()
 
     def startup(self, persistent):
         self.reset_state_vars()
         self.mode = persistent.get("mode", "WARMUP")
-        self.config = persistent.get("config", {}).copy()
+        # Read-only from here on; its physics hash is computed once
+        self.config = ScenarioConfig(persistent.get("config", {}))
         
         self.display_name = persistent.get("name", "Unknown")
         self.origin = persistent.get("origin", "IMPORT")
@@ -49,20 +51,37 @@ class GameState(BaseState):
         else: self.icon = "📄"
 
 
-        self.scenario = Scenario.from_config(self.config)
-        self.duration = self.scenario.duration
-        self.engine.smoothing_window = self.config.get("smoothing", 75)
-        
-        self.engine.reset_graph()
-        self.engine.reset_history()
-        
-        if self.mode == "CHALLENGE":
-            self.timer = -float(self.config.get("warmup_time", 0))
+        # All scoring lives in the Simulation; this state only feeds it input and draws it
+        # Graph history only needs to cover the past half of the screen
+        self.sim = Simulation(self.config, self.mode, self.app.global_settings.get("sensitivity", 100),
+                              record=(self.mode == "CHALLENGE"), graph_capacity=cfg.SCREEN_WIDTH // 2 + 1)
+        self.scenario = self.sim.scenario
+        self.engine = self.sim.engine
+        self.duration = self.sim.duration
         
         pygame.event.set_grab(True); pygame.mouse.set_visible(False); pygame.mouse.get_rel()
         
-        if self.graph_surf.get_size() != (cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT):
-            self.graph_surf = pygame.Surface((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT), pygame.SRCALPHA)
+        future_w = cfg.SCREEN_WIDTH - cfg.SCREEN_WIDTH // 2
+        if self.graph_surf.get_size() != (future_w, cfg.SCREEN_HEIGHT):
+            self.graph_surf = pygame.Surface((future_w, cfg.SCREEN_HEIGHT), pygame.SRCALPHA)
+        
+        # Same scenario/zoom/resolution as last run (e.g. [Z] retry) keeps the cached band
+        zoom = self.config.get("zoom_scale", 3)
+        self.config_hash = self.config.hash
+        band_key = (self.config_hash, zoom, cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)
+        self.band.build(band_key, self.scenario, cfg.SCREEN_HEIGHT - 100, zoom * 0.2)
+        self.past_layer = PastGraphLayer(cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT, cfg.SCREEN_HEIGHT - 100, zoom * 0.2)
+        if self.dim_overlay is None or self.dim_overlay.get_size() != (cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT):
+            self.dim_overlay = pygame.Surface((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)); self.dim_overlay.set_alpha(200); self.dim_overlay.fill((0,0,0))
+
+        # PB looked up now, so the frame the run ends doesn't have to
+        self.previous_best = self.app.storage.get_high_score(self.config_hash)
+
+    def apply_quality(self):
+        """Render-only settings from the quality governor (never touches the simulation)."""
+        q = self.app.quality.settings
+        self.particles.max_particles = q["particles"]
+        self.past_layer.set_style(q["band_fill"], q["line_width"])
 
     def cleanup(self):
         pygame.event.set_grab(False)
@@ -90,62 +109,38 @@ class GameState(BaseState):
                 pygame.mouse.set_visible(False)
 
     def update(self, dt):
-        if dt > 0.1: dt = 0.1
-        if dt < 0.001: dt = 0.001
-
+        raw_dt = dt # The simulation clamps on its own, after recording the raw frame
+        dt = clamp_dt(dt)
         dx, dy = pygame.mouse.get_rel()
-        multiplier = self.app.global_settings.get("sensitivity", 100) / 100.0
-        dx *= multiplier
-        dy *= multiplier
 
         # --- UPDATE PARTICLES ---
         # Update them every frame, regardless of game state
         self.particles.update(dt, cfg.SCREEN_HEIGHT)
         
         # If it's the FOUNTAIN style, we keep emitting while on the result screen!
-        if self.run_finished and self.is_pb and self.vfx_mode == "FOUNTAIN":
+        if self.sim.finished and self.is_pb and self.vfx_mode == "FOUNTAIN":
             self.particles.emit(cfg.SCREEN_WIDTH//2, cfg.SCREEN_HEIGHT + 10, count=5)
         # ------------------------
 
-        if self.mode == "CHALLENGE" and not self.run_finished:
-            self.timer += dt
-            if self.timer >= self.duration:
-                self.finish_challenge()
-                return
-
-        sim_time = max(0.0, self.timer)
-        target_speed, target_tol, target_dirs = self.scenario.get_state_at(sim_time)
-        speed, status, diff = self.engine.process_frame(dx, dy, dt, target_speed, target_tol, target_dirs)
+        was_finished = self.sim.finished
+        status = self.sim.step(raw_dt, dx, dy)
+        if self.sim.finished and not was_finished:
+            self.finish_challenge()
+            return
         
-        if self.mode == "WARMUP" or (self.mode == "CHALLENGE" and self.timer >= 0 and not self.run_finished):
-             self.app.audio.update(dt, status)
-             if status == "PERFECT":
-                 if self.mode == "WARMUP": self.time_in_zone += dt
-                 else: self.time_in_zone += dt
+        if self.sim.scoring:
+             # Speed error in tolerances, for pitch follow
+             error = self.sim.diff / self.sim.tolerance if self.sim.tolerance else 0.0
+             self.app.audio.update(dt, status, error)
         else:
              self.app.audio.stop_all()
 
-        color = COLOR_ZONE_LINE
-        if status == "LOW": color = COLOR_SLOW
-        elif status == "HIGH": color = COLOR_FAST
-        elif status == "PERFECT": color = COLOR_PERFECT
-        
-        self.engine.record_graph_point(dt, speed, color, target_speed, target_tol)
-
     def finish_challenge(self):
-        self.run_finished = True
         self.app.audio.stop_all()
-        self.timer = self.duration
-        if self.duration > 0:
-            self.score = (self.time_in_zone / self.duration) * 100
-            if self.score > 100.0: self.score = 100.0
-                
-        from src.core.utils import generate_hash
-        curr_hash = generate_hash(self.config)
-        previous_best = self.app.storage.get_high_score(curr_hash)
-        
-        if self.score > previous_best and self.score > 0:
-            self.is_pb = True; self.cached_pb = self.score
+        previous_best = self.previous_best
+
+        if self.sim.score > previous_best and self.sim.score > 0:
+            self.is_pb = True; self.cached_pb = self.sim.score
             
             # --- TRIGGER PARTICLES (ONE SHOT) ---
             if self.vfx_mode == "POPPER":
@@ -162,63 +157,51 @@ class GameState(BaseState):
             "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
             "config": f"{self.icon} {self.display_name}",
             "target": f"{int(self.scenario.keyframes[0].speed)}->{int(self.scenario.keyframes[-1].speed)}",
-            "score": round(self.score, 2),
-            "hash": curr_hash
+            "score": round(self.sim.score, 2),
+            "hash": self.config_hash
         }
-        self.app.storage.save_run(entry)
+        
+        # Row + input trace are written by the storage's background writer. The trace is
+        # handed over, not shared, so nothing on this thread can append to it mid-write
+        trace, self.sim.trace = self.sim.trace, None
+        self.app.storage.save_run(entry, trace, self.sim.sensitivity)
 
     def draw(self, screen):
+        prof = self.app.profiler
+        self.apply_quality()
         screen.fill(BG_COLOR)
-        self.draw_graph_view(screen)
-        self.draw_hud(screen)
+        with prof.stage("graph"): self.draw_graph_view(screen)
+        with prof.stage("hud"): self.draw_hud(screen)
         
         # --- DRAW PARTICLES ON TOP ---
-        self.particles.draw(screen)
+        with prof.stage("particles"): self.particles.draw(screen)
 
     def draw_graph_view(self, screen):
-        # ... (This method stays exactly as optimized before, no changes needed) ...
         rect = pygame.Rect(0, 0, cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT - 100)
-        scale = self.config.get("zoom_scale", 3) * 0.2
         cx = cfg.SCREEN_WIDTH // 2 
-        self.graph_surf.fill((0, 0, 0, 0))
         
-        points = self.engine.graph_points
-        if len(points) > 1:
-            upper_past, lower_past, line_pts = [], [], []
-            start_index = max(0, len(points) - cx)
-            visible_points = list(points)[start_index:]
-            offset = len(visible_points) - 1
-            for i, (spd, col, tgt, h_tol) in enumerate(visible_points):
-                x = cx - (offset - i)
-                yu = rect.bottom - ((tgt + h_tol) * scale)
-                yl = rect.bottom - ((tgt - h_tol) * scale)
-                ys = rect.bottom - (spd * scale)
-                upper_past.append((x, max(0, yu))); lower_past.append((x, max(0, yl)))
-                line_pts.append((x, max(0, ys), col))
-            if len(upper_past) > 1:
-                poly = upper_past + lower_past[::-1]
-                pygame.draw.polygon(self.graph_surf, (255, 255, 255, 30), poly)
-                pygame.draw.lines(screen, COLOR_ZONE_LINE, False, upper_past, 1)
-                pygame.draw.lines(screen, COLOR_ZONE_LINE, False, lower_past, 1)
-            for i in range(len(line_pts)-1):
-                p1, p2 = line_pts[i], line_pts[i+1]
-                pygame.draw.line(screen, p2[2], (p1[0], p1[1]), (p2[0], p2[1]), 2)
+        # Past half: only the columns for points added since last frame get rasterized
+        self.past_layer.update(self.engine.graph_points)
+        self.past_layer.draw(screen)
 
         future_pixels = cfg.SCREEN_WIDTH - cx
-        upper_fut, lower_fut = [], []
-        dt_per_px = 1.0 / self.engine.REFERENCE_FPS 
-        for i in range(future_pixels):
-            x, pixel_time = cx + i, self.timer + (i * dt_per_px)
-            tgt, f_tol, _ = self.scenario.get_state_at(pixel_time)
-            yu = rect.bottom - ((tgt + f_tol) * scale); yl = rect.bottom - ((tgt - f_tol) * scale)
-            upper_fut.append((x, max(0, yu))); lower_fut.append((x, max(0, yl)))
+        render_timer = self.sim.get_render_timer() # Smooth between fixed physics steps
+        upper_ys, lower_ys = self.band.window(render_timer, future_pixels)
+        xs = range(cx, cx + future_pixels)
+        upper_fut = list(zip(xs, upper_ys)); lower_fut = list(zip(xs, lower_ys))
+        band_fill = self.app.quality.settings["band_fill"] # Outline only at low quality
+        if band_fill: self.graph_surf.fill((0, 0, 0, 0))
         if len(upper_fut) > 1:
-            poly = upper_fut + lower_fut[::-1]
-            pygame.draw.polygon(self.graph_surf, (255, 255, 255, 30), poly)
+            if band_fill:
+                # The alpha surface only covers the future half
+                poly = [(x - cx, y) for x, y in upper_fut + lower_fut[::-1]]
+                pygame.draw.polygon(self.graph_surf, BAND_FILL, poly)
             pygame.draw.lines(screen, (60, 60, 60), False, upper_fut, 1)
             pygame.draw.lines(screen, (60, 60, 60), False, lower_fut, 1)
         
-        screen.blit(self.graph_surf, (0,0))
+        if band_fill:
+            self.past_layer.fill_seam(self.graph_surf, cx, self.engine.graph_points)
+            screen.blit(self.graph_surf, (cx, 0))
         pygame.draw.line(screen, (100, 100, 100), (cx, 0), (cx, rect.bottom), 1)
 
     def draw_hud(self, screen):
@@ -233,9 +216,11 @@ class GameState(BaseState):
             draw_txt("[ESC] Hub", cfg.SCREEN_HEIGHT - 100, ACCENT_COLOR)
         
         elif self.mode == "CHALLENGE":
-            if self.run_finished:
-                overlay = pygame.Surface((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)); overlay.set_alpha(200); overlay.fill((0,0,0))
-                screen.blit(overlay, (0,0))
+            if self.sim.finished:
+                if self.app.quality.settings["dim_alpha"]:
+                    screen.blit(self.dim_overlay, (0,0))
+                else:
+                    screen.fill((10, 10, 10)) # Roughly what the 200/255 black overlay leaves of BG_COLOR
                 
                 draw_txt(f"{self.icon} {self.display_name}", 50, self.title_color)
                 if self.is_pb:
@@ -246,12 +231,13 @@ class GameState(BaseState):
                 elif self.cached_pb > 0:
                     draw_txt(f"PB: {self.cached_pb:.2f}%", cfg.SCREEN_HEIGHT//2 - 120, TEXT_GRAY)
                 
-                draw_txt(f"{self.score:.2f}%", cfg.SCREEN_HEIGHT//2 - 40, COLOR_PERFECT, self.font_big)
+                draw_txt(f"{self.sim.score:.2f}%", cfg.SCREEN_HEIGHT//2 - 40, COLOR_PERFECT, self.font_big)
                 draw_txt("[Z] Retry   [ESC] Hub", cfg.SCREEN_HEIGHT//2 + 110, ACCENT_COLOR)
             else:
                 draw_txt(f"{self.icon} {self.display_name}", 30, self.title_color)
-                if self.timer < 0:
-                    draw_txt(f"{abs(self.timer):.1f}", 360, COLOR_REC, self.font_big)
+                render_timer = self.sim.get_render_timer()
+                if render_timer < 0:
+                    draw_txt(f"{abs(render_timer):.1f}", 360, COLOR_REC, self.font_big)
                 else:
-                    rem = max(0, self.duration - self.timer)
+                    rem = max(0, self.duration - render_timer)
                     draw_txt(f"{rem:.1f}", 70, UI_COLOR, self.font_big)
\ No newline at end of file
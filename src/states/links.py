@@ -1,6 +1,4 @@
 import pygame
-import threading
-import urllib.request
 import json
 import src.core.config as cfg
 from src.core.config import *
@@ -27,20 +25,18 @@ class LinksState(BaseState):
         self.fetch_links()
 
     def fetch_links(self):
-        def _run():
+        def _done(body, error):
             try:
-                with urllib.request.urlopen(cfg.LINKS_URL, timeout=3) as url:
-                    # Expecting JSON: [{"text": "Title", "url": "http..."}, ...]
-                    data = json.loads(url.read().decode())
-                    if isinstance(data, list) and len(data) > 0:
-                        self.links_data = data
-                        self.rebuild_buttons()
+                if error is not None: raise error
+                # Expecting JSON: [{"text": "Title", "url": "http..."}, ...]
+                data = json.loads(body.decode())
+                if isinstance(data, list) and len(data) > 0:
+                    self.links_data = data
+                    self.rebuild_buttons()
             except Exception as e:
                 print(f"Links Fetch Error: {e}")
 
-        t = threading.Thread(target=_run)
-        t.daemon = True
-        t.start()
+        self.app.fetcher.get(cfg.LINKS_URL, _done)
 
     def rebuild_buttons(self):
         """Creates LinkButton objects based on current data"""
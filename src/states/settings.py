@@ -3,6 +3,8 @@ from src.states.base import BaseState
 import src.core.config as cfg
 from src.core.config import *
 from src.ui.elements import Button, Slider, Toggle
+from src.core.quality import QUALITY_NAMES
+from src.engine.audio import AUDIO_BUFFER_SIZES
 
 class SettingsState(BaseState):
     def __init__(self, app):
@@ -30,6 +32,10 @@ class SettingsState(BaseState):
         show_fps = self.app.global_settings.get("show_fps", False)
         self.tog_fps = Toggle(cx + 20, 240, 60, 30, "ON", show_fps)
 
+        # Quality: y=275, cycles AUTO -> fixed levels
+        self.quality_mode = self.app.global_settings.get("quality", "AUTO")
+        self.btn_quality = Button(cx + 20, 275, 110, 28, self.quality_mode, "CYCLE_QUALITY", color=(60, 60, 80))
+
         # --- 2. AUDIO (Moved down to y=350 to leave breathing room) ---
         s = self.app.global_settings
         base_y = 350
@@ -43,15 +49,25 @@ class SettingsState(BaseState):
         self.sl_miss_freq = Slider(600, base_y + 110, 250, 10, 100, 2000, s.get("miss_freq", 100), "Miss Freq")
         
         self.sl_tick = Slider(450, base_y + 200, 300, 10, 0, 30, s.get("tick_rate", 20), "Tick Rate")
+
+        # Pitch follow: replaces drones/ticks with one tone that bends with the speed error
+        self.tog_pitch = Toggle(900, base_y + 190, 60, 30, "ON", s.get("pitch_follow", False))
+
+        # Mixer buffer: y=620, cycles through AUDIO_BUFFER_SIZES (reopens the mixer)
+        self.btn_buffer = Button(cx + 20, base_y + 270, 140, 30, "", "CYCLE_BUFFER", color=(60, 60, 80))
+        self.btn_buffer.text = f"{self.app.audio.requested_buffer} samples"
         
         self.widgets = [
             self.btn_res,
             self.tog_fullscreen,
             self.tog_fps,
+            self.btn_quality,
             self.tog_hit, self.tog_miss,
             self.sl_hit_vol, self.sl_hit_freq,
             self.sl_miss_vol, self.sl_miss_freq,
-            self.sl_tick
+            self.sl_tick,
+            self.tog_pitch,
+            self.btn_buffer
         ]
 
     def handle_event(self, event):
@@ -69,6 +85,16 @@ class SettingsState(BaseState):
                 if action == "CYCLE_RES":
                     self.cycle_resolution()
                     return 
+
+                if action == "CYCLE_BUFFER":
+                    self.cycle_buffer()
+
+                if action == "CYCLE_QUALITY":
+                    modes = ["AUTO"] + QUALITY_NAMES
+                    idx = modes.index(self.quality_mode) if self.quality_mode in modes else 0
+                    self.quality_mode = modes[(idx + 1) % len(modes)]
+                    self.btn_quality.text = self.quality_mode
+                    self.app.quality.set_mode(self.quality_mode)
                 
         
          # --- FULLSCREEN LOGIC ---
@@ -90,7 +116,8 @@ class SettingsState(BaseState):
             self.tog_hit.active, self.tog_miss.active,
             self.sl_hit_vol.val/100.0, self.sl_miss_vol.val/100.0,
             self.sl_hit_freq.val, self.sl_miss_freq.val,
-            self.sl_tick.val
+            self.sl_tick.val,
+            self.tog_pitch.active
         )
 
     def save_and_exit(self):
@@ -102,14 +129,18 @@ class SettingsState(BaseState):
             "hit_freq": self.sl_hit_freq.val,
             "miss_freq": self.sl_miss_freq.val,
             "tick_rate": self.sl_tick.val,
+            "pitch_follow": self.tog_pitch.active,
             
             "res_w": cfg.SCREEN_WIDTH,
             "res_h": cfg.SCREEN_HEIGHT,
             # NEW: Save FPS Setting
             "show_fps": self.tog_fps.active,
+            "quality": self.quality_mode,
+            "audio_buffer": self.app.audio.requested_buffer,
             
             # Preserve Globals
             "sensitivity": self.app.global_settings.get("sensitivity", 100), 
+            "show_profiler": self.app.global_settings.get("show_profiler", False),
             "last_active_tab": self.app.global_settings.get("last_active_tab", 1)
         }
         self.app.storage.save_global_settings(data)
@@ -140,6 +171,12 @@ class SettingsState(BaseState):
         fps_label = self.font.render("Show FPS Counter", True, TEXT_GRAY)
         screen.blit(fps_label, (cx - 20 - fps_label.get_width(), 245))
 
+        # Quality Label + the level actually in use (AUTO moves it with frame times)
+        q_label = self.font.render("Graphics Quality", True, TEXT_GRAY)
+        screen.blit(q_label, (cx - 20 - q_label.get_width(), 277))
+        active = self.font.render(f"Active: {self.app.quality.name}", True, TEXT_GRAY)
+        screen.blit(active, (cx + 140, 277))
+
         # --- AUDIO SECTION ---
         # Divider line between Video and Audio
         pygame.draw.line(screen, (50, 50, 50), (100, 310), (cfg.SCREEN_WIDTH-100, 310))
@@ -157,13 +194,40 @@ class SettingsState(BaseState):
         # Bottom status text for Audio
         rate_val = self.sl_tick.val
         msg = "Continuous Drone" if rate_val == 0 else f"{rate_val} Shots / Sec"
+        if self.tog_pitch.active: msg = "Pitch Follows Speed Error"
+        pitch_label = self.font.render("Pitch Follow", True, TEXT_GRAY)
+        screen.blit(pitch_label, (900 + 30 - pitch_label.get_width()//2, 515)) # Above the toggle (base_y + 190)
         self.draw_text_centered(screen, msg, 585, TEXT_GRAY) # base_y + 235
 
+        # Mixer buffer label + what it actually costs
+        buf_label = self.font.render("Audio Buffer", True, TEXT_GRAY)
+        screen.blit(buf_label, (cx - 20 - buf_label.get_width(), 625))
+        audio = self.app.audio
+        latency = audio.get_latency_ms()
+        if latency is None:
+            info = "No audio device"
+        else:
+            info = f"{latency:.1f} ms @ {audio.sample_rate} Hz"
+            if audio.buffer != audio.requested_buffer:
+                info += f" (device wants {audio.buffer})"
+        info_surf = self.font.render(info, True, TEXT_GRAY)
+        screen.blit(info_surf, (cx + 170, 625))
+
     def draw_text_centered(self, screen, text, y, color):
         s = self.font.render(text, True, color)
         # Use cfg.SCREEN_WIDTH for centering
         screen.blit(s, (cfg.SCREEN_WIDTH//2 - s.get_width()//2, y))
 
+    def cycle_buffer(self):
+        sizes = AUDIO_BUFFER_SIZES
+        current = self.app.audio.requested_buffer
+        idx = sizes.index(current) if current in sizes else 0
+        new_size = sizes[(idx + 1) % len(sizes)]
+
+        self.app.audio.start_mixer(new_size)
+        self.update_live_audio()
+        self.btn_buffer.text = f"{new_size} samples"
+
     def cycle_resolution(self):
         modes = [(1600, 900), (1920, 1080), (2560, 1440)]
         current = (cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)
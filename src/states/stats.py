@@ -1,60 +1,166 @@
 import pygame
+from collections import OrderedDict
 from src.states.base import BaseState
 import src.core.config as cfg
 from src.core.config import *
 from src.ui.elements import Button
 
+ROW_H = 30
+TABLE_TOP = 120
+FOOTER_H = 60
+BLOCK_SIZE = 100 # Rows fetched from the run DB per query
+MAX_BLOCKS = 8   # Blocks kept in memory, least recently viewed dropped first
+
 class StatsState(BaseState):
+    """
+    Run history table. Nothing is queried or rendered per frame: rows are fetched in
+    blocks as they scroll into view, each row is rendered once, and the visible part of
+    the table is composed into one cached surface that only changes when the scroll
+    position, the screen size or the history (storage.revision) does.
+    """
     def __init__(self, app):
         super().__init__(app)
         self.font = pygame.font.SysFont(["segoe ui symbol", "arial", "sans-serif"], 20)
         self.font_big = pygame.font.SysFont(["segoe ui symbol", "arial", "sans-serif"], 40)
         self.btn_back = Button(20, 20, 100, 30, "< BACK", "BACK")
+        self.title_surf = self.font_big.render("HISTORY", True, UI_COLOR)
+
+        self.revision = None
+        self.total = 0
+        self.scroll = 0 # Index of the top visible row
+        self.blocks = OrderedDict() # block index -> [[entry, rendered row or None], ...]
+        self.table_surf = None
+        self.table_key = None
+
+    def startup(self, persistent):
+        super().startup(persistent)
+        self.scroll = 0
+        self.reload()
+
+    def reload(self):
+        """Drops every cached row; they are fetched again as they come into view."""
+        self.revision = self.app.storage.revision
+        self.total = self.app.storage.count_runs()
+        self.blocks.clear()
+        self.table_key = None
+        self.clamp_scroll()
+
+    # --- Scrolling ---
+
+    def visible_rows(self):
+        return max(1, (cfg.SCREEN_HEIGHT - TABLE_TOP - FOOTER_H) // ROW_H)
+
+    def clamp_scroll(self):
+        self.scroll = max(0, min(self.scroll, self.total - self.visible_rows()))
 
     def handle_event(self, event):
         if self.btn_back.handle_event(event) == "BACK":
             self.next_state = "EDITOR"
             self.done = True
+            return
+
+        page = self.visible_rows()
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll -= event.y * 3
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_DOWN: self.scroll += 1
+            elif event.key == pygame.K_UP: self.scroll -= 1
+            elif event.key == pygame.K_PAGEDOWN: self.scroll += page
+            elif event.key == pygame.K_PAGEUP: self.scroll -= page
+            elif event.key == pygame.K_HOME: self.scroll = 0
+            elif event.key == pygame.K_END: self.scroll = self.total
+        self.clamp_scroll()
+
+    def update(self, dt):
+        if self.app.storage.revision != self.revision:
+            self.reload()
+
+    # --- Rows ---
+
+    def get_block(self, b):
+        block = self.blocks.get(b)
+        if block is None:
+            rows = self.app.storage.load_stats(limit=BLOCK_SIZE, offset=b * BLOCK_SIZE)
+            block = self.blocks[b] = [[row, None] for row in rows]
+            if len(self.blocks) > MAX_BLOCKS:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(b)
+        return block
+
+    def get_row_surface(self, i):
+        block = self.get_block(i // BLOCK_SIZE)
+        j = i % BLOCK_SIZE
+        if j >= len(block): return None
+        slot = block[j]
+        if slot[1] is None:
+            slot[1] = self.render_row(slot[0])
+        return slot[1]
+
+    def render_row(self, row):
+        c = UI_COLOR
+
+        score = row.get('score', 0)
+        if score >= 90: c = COLOR_PERFECT
+
+        date_str = row.get('date', '')
+        # Strip seconds/year if too long
+        date_str = date_str[5:] # Remove YYYY-
+
+        conf = row.get('config', 'Legacy')
+        tgt = str(row.get('target', '???'))
+
+        # Formatting
+        txt_str = f"{date_str:<12} | {conf:<20} | {tgt:<12} | {score:.2f}%"
+        return self.font.render(txt_str, True, c)
+
+    def build_table(self):
+        """Composes the visible rows, the scrollbar and the footer into one surface."""
+        w = cfg.SCREEN_WIDTH
+        rows = self.visible_rows()
+        surf = pygame.Surface((w, rows * ROW_H + FOOTER_H)).convert()
+        surf.fill(STATS_BG_COLOR)
+
+        # Only the rows on screen are fetched/rendered, whatever the size of the history
+        last = min(self.total, self.scroll + rows)
+        for i in range(self.scroll, last):
+            row_surf = self.get_row_surface(i)
+            if row_surf is None: break
+            surf.blit(row_surf, (w//2 - row_surf.get_width()//2, (i - self.scroll) * ROW_H))
+
+        # Scrollbar
+        if self.total > rows:
+            track_h = rows * ROW_H
+            thumb_h = max(20, track_h * rows // self.total)
+            thumb_y = (track_h - thumb_h) * self.scroll // (self.total - rows)
+            pygame.draw.rect(surf, (40, 40, 50), (w - 110, 0, 6, track_h))
+            pygame.draw.rect(surf, ACCENT_COLOR, (w - 110, thumb_y, 6, thumb_h))
+
+        # Footer
+        page = -(-last // rows) # The last page is the one showing the oldest run
+        pages = max(1, -(-self.total // rows))
+        info = f"Runs {self.scroll + 1}-{last} of {self.total}   |   Page {page}/{pages}   |   Wheel / PgUp / PgDn / Home / End"
+        info_surf = self.font.render(info, True, TEXT_GRAY)
+        surf.blit(info_surf, (w//2 - info_surf.get_width()//2, rows * ROW_H + 20))
+        return surf
 
     def draw(self, screen):
         screen.fill(STATS_BG_COLOR)
         self.btn_back.draw(screen, self.font)
-        
+
         # Title
-        t = self.font_big.render("HISTORY", True, UI_COLOR)
-        screen.blit(t, (cfg.SCREEN_WIDTH//2 - t.get_width()//2, 40))
-        
+        screen.blit(self.title_surf, (cfg.SCREEN_WIDTH//2 - self.title_surf.get_width()//2, 40))
+
         # Header Line
         pygame.draw.line(screen, ACCENT_COLOR, (100, 90), (cfg.SCREEN_WIDTH-100, 90))
-        
-        # Load Stats
-        history = self.app.storage.load_stats()
-        y = 120
-        
-        if not history:
+
+        if not self.total:
             msg = self.font.render("No runs recorded yet.", True, TEXT_GRAY)
             screen.blit(msg, (cfg.SCREEN_WIDTH//2 - msg.get_width()//2, 150))
             return
 
-        # Draw Table
-        # We limit to 20 entries for now to avoid scrolling complexity
-        for i, row in enumerate(history[:20]):
-            c = UI_COLOR
-            
-            score = row.get('score', 0)
-            if score >= 90: c = COLOR_PERFECT
-            
-            date_str = row.get('date', '')
-            # Strip seconds/year if too long
-            date_str = date_str[5:] # Remove YYYY-
-            
-            conf = row.get('config', 'Legacy')
-            tgt = str(row.get('target', '???'))
-            
-            # Formatting
-            txt_str = f"{date_str:<12} | {conf:<20} | {tgt:<12} | {score:.2f}%"
-            
-            surf = self.font.render(txt_str, True, c)
-            # Center it
-            screen.blit(surf, (cfg.SCREEN_WIDTH//2 - surf.get_width()//2, y))
-            y += 30
\ No newline at end of file
+        key = (self.scroll, self.total, cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)
+        if key != self.table_key:
+            self.table_surf = self.build_table()
+            self.table_key = key
+        screen.blit(self.table_surf, (0, TABLE_TOP))
\ No newline at end of file
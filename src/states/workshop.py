@@ -3,7 +3,7 @@ import src.core.config as cfg
 from src.core.config import *
 from src.states.base import BaseState
 from src.ui.elements import Slider, Button, Toggle, NameModal, TextInput, IconButton
-from src.core.utils import generate_hash
+from src.core.utils import ScenarioConfig
 import uuid # For Save As salt
 
 class WorkshopState(BaseState):
@@ -80,7 +80,7 @@ class WorkshopState(BaseState):
         self.original_origin = persistent.get("origin", "IMPORT")
         
         self.apply_data_to_sliders(self.db_source_config)
-        self.baseline_config = self.get_current_data()
+        self.baseline_config = ScenarioConfig(self.get_current_data())
         
         self.txt_author.text = self.db_source_config.get("author", "")
         self.txt_desc.text = self.db_source_config.get("description", "")
@@ -233,7 +233,8 @@ class WorkshopState(BaseState):
                 self.open_save_as()
 
     def is_dirty(self):
-        return generate_hash(self.get_current_data()) != generate_hash(self.baseline_config)
+        # Compares the physics directly instead of hashing both sides every frame
+        return not self.baseline_config.same_physics(self.get_current_data())
 
     def open_save_as(self):
         default_name = f"{self.original_name} [MOD]"
@@ -194,7 +194,7 @@ class Slider:
         self.val_box.draw(screen, font)
 
     def set_val(self, v):
-        self.val = max(self.min_val, min(self.max_val, int(v)))
+        self.val = max(self.min_val, min(self.max_val, int(float(v)))) # Configs may hold "75.5"
         self.val_box.text = str(self.val)
 
 class TabbedBrowser:
@@ -207,6 +207,12 @@ class TabbedBrowser:
         self.scroll_y = 0
         self.items = []
         self.selected_hash = None
+        self.online_revision = None # storage.online_revision the current items were built from
+        # Per-row data worked out once in refresh(), parallel to self.items
+        self.item_hashes = []
+        self.item_pinned = []
+        self.row_cache = {} # index -> (name surface, pb, pb surface), dropped on refresh
+        self.row_font = None
         self.refresh()
     
     def set_selection(self, config_data):
@@ -230,7 +236,8 @@ class TabbedBrowser:
         elif tab_key == "OFFICIAL":
             raw_list = self.storage.get_online_scenarios(cfg.SCENARIOS_OFFICIAL_URL)
         elif tab_key == "COMMUNITY":
-            raw_list = self.storage.get_online_scenarios(cfg.SCENARIOS_COMMUNITY_URL)
+            raw_list = self.storage.get_community_scenarios()
+        self.online_revision = self.storage.online_revision
 
         
         # --- NEW: PINNING SORT LOGIC ---
@@ -241,14 +248,19 @@ class TabbedBrowser:
         for item in raw_list:
             # Note: We need to handle the 'Online' wrapper correctly
             data_to_check = item["data"] if "data" in item else item
+            h = generate_hash(data_to_check)
             
             if self.storage.is_starred(tab_key, data_to_check):
-                pinned.append(item)
+                pinned.append((item, h))
             else:
-                unpinned.append(item)
+                unpinned.append((item, h))
         
         # 2. Combine them (Pinned always on top)
-        self.items = pinned + unpinned
+        rows = pinned + unpinned
+        self.items = [item for item, h in rows]
+        self.item_hashes = [h for item, h in rows]
+        self.item_pinned = [True] * len(pinned) + [False] * len(unpinned)
+        self.row_cache = {}
         # -------------------------------
         
         self.scroll_y = min(self.scroll_y, max(0, len(self.items)*25 - (self.rect.height - 40)))
@@ -297,12 +309,18 @@ class TabbedBrowser:
                         
                         # Selection Logic
                         item = self.items[idx]
-                        data_to_hash = item["data"] if "data" in item else item
-                        self.selected_hash = generate_hash(data_to_hash) # <--- Update highlight
+                        self.selected_hash = self.item_hashes[idx] # <--- Update highlight
                         return item
         return None
 
     def draw(self, screen, font):
+        # An online list finished loading in the background -> rebuild the rows
+        if self.online_revision != self.storage.online_revision and self.tabs[self.active_tab] in ("OFFICIAL", "COMMUNITY"):
+            self.refresh()
+
+        if font is not self.row_font:
+            self.row_cache = {}; self.row_font = font
+
         pygame.draw.rect(screen, (25, 25, 30), self.rect)
         pygame.draw.rect(screen, (50, 50, 50), self.rect, 2)
         
@@ -313,7 +331,10 @@ class TabbedBrowser:
             color = ACCENT_COLOR if i == self.active_tab else (60, 60, 60)
             pygame.draw.rect(screen, color, (tx, self.rect.y, tab_w, 30))
             pygame.draw.rect(screen, (20, 20, 20), (tx, self.rect.y, tab_w, 30), 1)
-            lbl = font.render(t, True, UI_COLOR if i == self.active_tab else (150, 150, 150))
+            lbl_key = ("tab", t, i == self.active_tab)
+            lbl = self.row_cache.get(lbl_key)
+            if lbl is None:
+                lbl = self.row_cache[lbl_key] = font.render(t, True, UI_COLOR if i == self.active_tab else (150, 150, 150))
             screen.blit(lbl, (tx + tab_w//2 - lbl.get_width()//2, self.rect.y + 5))
             
         # Draw List with Clipping
@@ -321,35 +342,48 @@ class TabbedBrowser:
         view_rect = pygame.Rect(self.rect.x + 2, self.rect.y + 35, self.rect.width - 4, self.rect.height - 37)
         screen.set_clip(view_rect)
         start_y = self.rect.y + 40 - self.scroll_y
-        tab_key = self.tabs[self.active_tab]
         
-        for i, cfg_item in enumerate(self.items):
+        # Only the rows that can be on screen (no hashing here, refresh() did that)
+        first = max(0, (view_rect.top - start_y) // 25 - 1)
+        last = min(len(self.items), (view_rect.bottom - start_y) // 25 + 1)
+        for i in range(first, last):
+            cfg_item = self.items[i]
             y = start_y + (i * 25)
             if y + 25 < view_rect.top or y > view_rect.bottom: continue
-            
-            # --- NEW: DRAW STAR ---
-            data_to_check = cfg_item["data"] if "data" in cfg_item else cfg_item
 
             # --- HIGHLIGHT SELECTED ---
-            if generate_hash(data_to_check) == self.selected_hash:
+            item_hash = self.item_hashes[i]
+            if item_hash == self.selected_hash:
                 # Draw a subtle blue-grey bar behind the text
                 highlight_rect = pygame.Rect(self.rect.x + 2, y, self.rect.width - 4, 25)
                 pygame.draw.rect(screen, (45, 55, 65), highlight_rect)
             # --------------------------
 
-            is_pinned = self.storage.is_starred(tab_key, data_to_check)
-            
-            star_color = COLOR_PERFECT if is_pinned else (100, 100, 100)
-            star_glyph = "★" if is_pinned else "☆"
-            
-            star_surf = font.render(star_glyph, True, star_color)
+            # --- NEW: DRAW STAR ---
+            is_pinned = self.item_pinned[i]
+            star_key = ("star", is_pinned)
+            star_surf = self.row_cache.get(star_key)
+            if star_surf is None:
+                star_color = COLOR_PERFECT if is_pinned else (100, 100, 100)
+                star_glyph = "★" if is_pinned else "☆"
+                star_surf = self.row_cache[star_key] = font.render(star_glyph, True, star_color)
             screen.blit(star_surf, (self.rect.x + 10, y))
             # ----------------------
 
+            # Name and PB are rendered once per refresh (PB again if it changes)
+            pb = self.storage.get_high_score(item_hash) # In-memory index, free to look up
+            row = self.row_cache.get(i)
+            if row is None or row[1] != pb:
+                name_surf = row[0] if row else font.render(self.storage.get_display_name(cfg_item), True, UI_COLOR)
+                pb_surf = font.render(f"{pb:.1f}%", True, COLOR_PERFECT if pb >= 90 else TEXT_GRAY) if pb > 0 else None
+                row = self.row_cache[i] = (name_surf, pb, pb_surf)
+
             # Draw Name (Offset to the right of the star)
-            name = self.storage.get_display_name(cfg_item)
-            name_surf = font.render(name, True, UI_COLOR)
-            screen.blit(name_surf, (self.rect.x + 40, y))
+            screen.blit(row[0], (self.rect.x + 40, y))
+
+            # PB on the right
+            if row[2] is not None:
+                screen.blit(row[2], (self.rect.right - 12 - row[2].get_width(), y))
             
         screen.set_clip(None)
 
@@ -0,0 +1,173 @@
+import math
+import pygame
+from src.core.config import BG_COLOR, COLOR_ZONE_LINE, COLOR_SLOW, COLOR_FAST, COLOR_PERFECT
+from src.engine.physics import REFERENCE_FPS
+from src.engine.graph_history import STATUS_NONE, STATUS_LOW, STATUS_HIGH, STATUS_PERFECT
+
+# Graph line color per status code
+GRAPH_COLORS = {
+    STATUS_NONE: COLOR_ZONE_LINE,
+    STATUS_LOW: COLOR_SLOW,
+    STATUS_HIGH: COLOR_FAST,
+    STATUS_PERFECT: COLOR_PERFECT,
+}
+BAND_FILL = (255, 255, 255, 30)
+
+class BandCache:
+    """
+    The scenario's target zone (upper/lower edge) in screen space, sampled once per
+    1/REFERENCE_FPS for the whole run. The future half of the graph is then just a
+    slice at the current timer instead of one get_state_at call per pixel per frame.
+    Rebuilt whenever the key (scenario hash, zoom, resolution) changes.
+    """
+    def __init__(self):
+        self.key = None
+        self.upper = []
+        self.lower = []
+
+    def invalidate(self):
+        self.key = None
+
+    def build(self, key, scenario, bottom, scale):
+        if key == self.key: return
+        self.key = key
+
+        step = 1.0 / REFERENCE_FPS
+        count = int(math.ceil(scenario.duration * REFERENCE_FPS)) + 1
+        upper, lower = [], []
+        for k in range(count):
+            tgt, tol, _ = scenario.get_state_at(k * step)
+            upper.append(max(0, bottom - ((tgt + tol) * scale)))
+            lower.append(max(0, bottom - ((tgt - tol) * scale)))
+        self.upper, self.lower = upper, lower
+
+    def _slice(self, ys, start, count):
+        # Before 0 and past the end the scenario is clamped, so repeat the edge values
+        n = len(ys)
+        lead = min(count, max(0, -start))
+        body = ys[max(0, start):max(0, min(n, start + count))]
+        tail = count - lead - len(body)
+        return [ys[0]] * lead + body + [ys[-1]] * tail
+
+    def window(self, timer, count):
+        """(upper, lower) y values for 'count' pixels starting at 'timer' seconds."""
+        if not self.upper: return [], []
+        start = round(timer * REFERENCE_FPS)
+        return self._slice(self.upper, start, count), self._slice(self.lower, start, count)
+
+class PastGraphLayer:
+    """
+    Retained image of the past half of the graph (zone band, its fill and the speed line).
+    Each frame the old pixels scroll left by the number of new 1/REFERENCE_FPS points and
+    only the freshly exposed columns are rasterized, so the draw cost follows elapsed
+    time instead of screen width. Columns are redrawn from scratch (clear, lines, then
+    the alpha fill on top), giving the same pixels as drawing the whole graph.
+    """
+    # Columns right of the newest point that a 2px line can still touch
+    SPILL = 1
+
+    def __init__(self, width, height, bottom, scale, band_fill=True, line_width=2):
+        self.cx = width // 2
+        self.bottom = bottom
+        self.scale = scale
+        self.band_fill = band_fill
+        self.line_width = line_width
+        self.layer = pygame.Surface((self.cx + 1 + self.SPILL, height))
+        self.generation = None
+        self.drawn_total = 0
+        self.has_points = False
+
+    def set_style(self, band_fill, line_width):
+        """Quality settings. A change forces a full redraw on the next update."""
+        if (band_fill, line_width) != (self.band_fill, self.line_width):
+            self.band_fill, self.line_width = band_fill, line_width
+            self.generation = None
+
+    def update(self, history):
+        """Brings the layer up to date with 'history' (a GraphHistory)."""
+        new_count = history.total - self.drawn_total
+        layer_w = self.layer.get_width()
+        self.has_points = len(history) > 1
+
+        if history.generation != self.generation or new_count >= layer_w - 3:
+            # New run or a very long hitch: redraw everything
+            self.generation = history.generation
+            self.drawn_total = history.total
+            self._render_columns(history, 0, layer_w - 1)
+            return
+        if new_count == 0:
+            return
+
+        self.drawn_total = history.total
+        self.layer.scroll(-new_count, 0)
+        # Right edge: the new points, plus one column for the segment reaching into them.
+        # Left edge: the oldest visible point moved, so its neighbourhood changes too.
+        self._render_columns(history, max(0, self.cx - new_count), layer_w - 1)
+        self._render_columns(history, 0, 2)
+
+    def _render_columns(self, history, x0, x1):
+        """Redraws columns x0..x1 (inclusive) from scratch."""
+        cx, bottom, scale = self.cx, self.bottom, self.scale
+        layer = self.layer
+        height = layer.get_height()
+        region = pygame.Rect(x0, 0, x1 - x0 + 1, height)
+        layer.fill(BG_COLOR, region)
+        if not self.has_points: return
+
+        # The visible graph is the newest cx points, ending at x = cx.
+        # A 2px segment from x to x+1 also paints x+2, so start two columns early.
+        speeds, codes, targets, tols = history.window(cx)
+        count = len(speeds)
+        first = max(0, (x0 - 2) - cx + count - 1)
+        last = min(count - 1, (x1 + 1) - cx + count - 1)
+        if last <= first: return
+
+        # Rasterize on a scratch strip wide enough to hold whole segments.
+        # (Clipping a line in pygame moves its endpoints and changes which pixels it hits.)
+        left = cx - (count - 1 - first)
+        scratch_w = (cx - (count - 1 - last)) - left + 1 + self.SPILL + 1
+        scratch = pygame.Surface((scratch_w, height))
+        scratch.fill(BG_COLOR)
+
+        upper, lower, line_pts = [], [], []
+        for i in range(first, last + 1):
+            x = cx - (count - 1 - i) - left
+            tgt, h_tol = targets[i], tols[i]
+            upper.append((x, max(0, bottom - ((tgt + h_tol) * scale))))
+            lower.append((x, max(0, bottom - ((tgt - h_tol) * scale))))
+            line_pts.append((x, max(0, bottom - (speeds[i] * scale)), GRAPH_COLORS[codes[i]]))
+
+        pygame.draw.lines(scratch, COLOR_ZONE_LINE, False, upper, 1)
+        pygame.draw.lines(scratch, COLOR_ZONE_LINE, False, lower, 1)
+        for i in range(len(line_pts) - 1):
+            p1, p2 = line_pts[i], line_pts[i + 1]
+            pygame.draw.line(scratch, p2[2], (p1[0], p1[1]), (p2[0], p2[1]), self.line_width)
+
+        # Alpha fill goes over the lines, like the full-screen overlay always did.
+        # Column cx is left out: it's shared with the future band (see fill_seam).
+        if self.band_fill:
+            fill = pygame.Surface(scratch.get_size(), pygame.SRCALPHA)
+            pygame.draw.polygon(fill, BAND_FILL, upper + lower[::-1])
+            fill.fill((0, 0, 0, 0), (cx - left, 0, scratch_w, height))
+            scratch.blit(fill, (0, 0))
+
+        layer.blit(scratch, region.topleft, region.move(-left, 0))
+
+    def fill_seam(self, surf, origin_x, history):
+        """
+        Draws the past band's fill for column cx onto 'surf' (placed at origin_x), the
+        same alpha surface as the future band, so the two overlap once, not twice.
+        """
+        if not self.has_points or not self.band_fill: return
+        speeds, codes, targets, tols = history.window(3)
+        count = len(speeds)
+        upper, lower = [], []
+        for i in range(count):
+            x = self.cx - (count - 1 - i) - origin_x
+            upper.append((x, max(0, self.bottom - ((targets[i] + tols[i]) * self.scale))))
+            lower.append((x, max(0, self.bottom - ((targets[i] - tols[i]) * self.scale))))
+        pygame.draw.polygon(surf, BAND_FILL, upper + lower[::-1])
+
+    def draw(self, screen):
+        if self.has_points:
+            screen.blit(self.layer, (0, 0))
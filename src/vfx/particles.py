@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+from itertools import compress
 
 # --- COLOR PALETTES ---
 PALETTE_PASTEL = [
@@ -17,152 +18,220 @@ PALETTE_RAINBOW = [
     (0, 128, 0), (0, 0, 255), (75, 0, 130), (238, 130, 238)
 ]
 
-class Particle:
-    def __init__(self, x, y, mode, overrides=None):
-        self.x = x
-        self.y = y
-        self.mode = mode
-        self.life = 1.0 
-        
-        # --- 1. DEFAULT SETTINGS ---
-        # (These are overwritten immediately below)
-        self.vx = 0
-        self.vy = 0
-        self.gravity = 0
-        self.drag = 0.95
-        self.size = 5
-        self.color = (255, 255, 255)
-        self.decay = 1.0
-        self.rotation = 0
-        self.spin_speed = 0
-        self.bounce = False
-
-        # --- 2. MODE DEFAULTS ---
+# --- MODE DEFAULTS ---
+# Physics that every particle of a mode shares. Per-particle randomness (velocity,
+# colour, size, decay, spin) is rolled in ParticleSystem.emit.
+MODE_PHYSICS = {
+    # mode: (gravity, drag, bounce)
+    "POPPER": (800, 0.92, False),
+    "STARS": (-40, 0.98, False),
+    "FOUNTAIN": (1200, 0.95, True),
+}
+MODE_PALETTES = {"POPPER": PALETTE_PASTEL, "STARS": PALETTE_GOLD, "FOUNTAIN": PALETTE_RAINBOW}
+
+ALPHA_BUCKETS = 16 # Fade steps; each one is its own pre-rendered sprite
+SPIN_BUCKETS = 8   # POPPER flip steps (sprite width)
+
+class SpriteAtlas:
+    """
+    Pre-rendered particle sprites. A "row" is the full fade of one look, i.e. every
+    alpha bucket for (mode, color, size, variant), indexed by int(life * ALPHA_BUCKETS).
+    The variant is the POPPER flip width or the STARS twinkle radius.
+    Rows are drawn the first time they're asked for, then reused.
+    """
+    def __init__(self):
+        self.rows = {}
+
+    def clear(self):
+        self.rows = {}
+
+    def row(self, mode, color, size, variant=0):
+        key = (mode, color, size, variant)
+        r = self.rows.get(key)
+        if r is None:
+            r = self.rows[key] = [self._render(mode, color, size, variant, self.bucket_alpha(b))
+                                  for b in range(ALPHA_BUCKETS + 1)]
+        return r
+
+    @staticmethod
+    def bucket_alpha(bucket):
+        return min(255, int((bucket + 0.5) * 255 / ALPHA_BUCKETS))
+
+    @staticmethod
+    def _render(mode, color, size, variant, alpha):
         if mode == "POPPER":
-            self.vx = random.uniform(-400, 400)
-            self.vy = random.uniform(-400, 400)
-            self.gravity = 800
-            self.drag = 0.92
-            self.color = random.choice(PALETTE_PASTEL)
-            self.size = random.randint(6, 10)
-            self.decay = random.uniform(0.3, 0.8)
-            self.spin_speed = random.uniform(5, 15)
-
+            s = pygame.Surface((variant, size), pygame.SRCALPHA)
+            s.fill((*color, alpha))
         elif mode == "STARS":
-            self.gravity = -40            
-            self.drag = 0.98              
-            
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(10, 150)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-
-            self.color = random.choice(PALETTE_GOLD)
-            self.size = random.randint(4, 9)       
-            self.decay = random.uniform(0.2, 0.6)  
-            # ----------------------------
-            
-            self.spin_speed = 0
-
-        elif mode == "FOUNTAIN":
-            angle = random.uniform(math.radians(250), math.radians(290))
-            speed = random.uniform(500, 900)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-            self.gravity = 1200
-            self.color = random.choice(PALETTE_RAINBOW)
-            self.size = random.randint(3, 8)
-            self.decay = random.uniform(0.4, 0.7)
-            self.bounce = True
-
-        # --- 3. APPLY OVERRIDES (FROM LAB) ---
-        if overrides:
-            # Physics
-            if 'gravity' in overrides: self.gravity = overrides['gravity']
-            if 'drag' in overrides: self.drag = overrides['drag']
-            
-            # Ranges (Randomness)
-            if 'size_min' in overrides and 'size_max' in overrides:
-                self.size = random.randint(overrides['size_min'], overrides['size_max'])
-            
-            if 'decay_min' in overrides and 'decay_max' in overrides:
-                self.decay = random.uniform(overrides['decay_min'], overrides['decay_max'])
-                
-            if 'speed_min' in overrides and 'speed_max' in overrides:
-                # Rescale velocity vector to new speed
-                current_speed = math.sqrt(self.vx**2 + self.vy**2)
-                if current_speed > 0:
-                    new_speed = random.uniform(overrides['speed_min'], overrides['speed_max'])
-                    ratio = new_speed / current_speed
-                    self.vx *= ratio
-                    self.vy *= ratio
-
-
-    def update(self, dt, screen_h):
-        self.life -= self.decay * dt
-        
-        self.vx *= self.drag
-        self.vy *= self.drag
-        self.vy += self.gravity * dt
-        
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.rotation += self.spin_speed * dt * 10
-
-        if self.bounce:
-            if self.y > screen_h:
-                self.y = screen_h
-                self.vy *= -0.6
-                self.vx *= 0.8
-
-    def draw(self, surface):
-        if self.life <= 0: return
-        alpha = int(max(0, self.life) * 255)
-        
-        if self.mode == "POPPER":
-            current_w = max(1, int(self.size * abs(math.sin(self.rotation))))
-            s = pygame.Surface((current_w, self.size), pygame.SRCALPHA)
-            s.fill((*self.color, alpha))
-            surface.blit(s, (int(self.x - current_w/2), int(self.y - self.size/2)))
-            
-        elif self.mode == "STARS":
-            twinkle = self.size + math.sin(pygame.time.get_ticks() * 0.01) * 2
-            r = max(1, int(twinkle))
+            r = variant
             s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (r, r), r//2)
+            pygame.draw.circle(s, (*color, alpha), (r, r), r//2)
             if alpha > 100:
-                pygame.draw.line(s, (*self.color, alpha//2), (r, 0), (r, r*2), 2)
-                pygame.draw.line(s, (*self.color, alpha//2), (0, r), (r*2, r), 2)
-            surface.blit(s, (int(self.x - r), int(self.y - r)))
-
+                pygame.draw.line(s, (*color, alpha//2), (r, 0), (r, r*2), 2)
+                pygame.draw.line(s, (*color, alpha//2), (0, r), (r*2, r), 2)
         else:
-            s = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            s.fill((*self.color, alpha))
-            surface.blit(s, (int(self.x), int(self.y)))
+            s = pygame.Surface((size, size), pygame.SRCALPHA)
+            s.fill((*color, alpha))
+        if pygame.display.get_surface() is not None:
+            s = s.convert_alpha()
+        return s
 
 class ParticleSystem:
-    def __init__(self, mode="POPPER"):
-        self.particles = []
+    """
+    Struct-of-arrays particle system: one list per attribute instead of one object per
+    particle. update() advances every particle with one comprehension per attribute
+    and compacts the arrays only on frames where something died. draw() looks the
+    sprites up in the atlas and hands the whole batch to a single Surface.blits call.
+    """
+    ATTRS = ("x", "y", "vx", "vy", "life", "decay", "rotation", "spin", "style")
+
+    def __init__(self, mode="POPPER", max_particles=5000):
         self.mode = mode
+        self.max_particles = max_particles # Quality budget; emit() stops at the cap
         self.overrides = {} # New: Stores active lab settings
+        self.atlas = SpriteAtlas()
+        self.styles = []  # (color, size) pairs; particles store an index into this
+        self.style_ids = {}
+        self.clear()
+
+    @property
+    def count(self):
+        return len(self.life)
+
+    def clear(self):
+        for name in self.ATTRS:
+            setattr(self, name, [])
 
     def set_mode(self, mode):
         if self.mode != mode:
             self.mode = mode
-            self.particles = []
+            self.clear()
             
     def set_overrides(self, data):
         self.overrides = data
 
+    def _physics(self):
+        gravity, drag, bounce = MODE_PHYSICS.get(self.mode, (0, 0.95, False))
+        gravity = self.overrides.get('gravity', gravity)
+        drag = self.overrides.get('drag', drag)
+        return gravity, drag, bounce
+
+    def _style(self, color, size):
+        key = (color, size)
+        sid = self.style_ids.get(key)
+        if sid is None:
+            sid = self.style_ids[key] = len(self.styles)
+            self.styles.append(key)
+        return sid
+
     def emit(self, x, y, count=10):
+        count = min(count, self.max_particles - self.count)
+        mode, ov = self.mode, self.overrides
+        palette = MODE_PALETTES.get(mode, [(255, 255, 255)])
+        uniform, randint = random.uniform, random.randint
         for _ in range(count):
-            self.particles.append(Particle(x, y, self.mode, self.overrides))
+            spin = 0
+            # --- MODE DEFAULTS (same distributions as the old Particle class) ---
+            if mode == "POPPER":
+                vx = uniform(-400, 400)
+                vy = uniform(-400, 400)
+                size = randint(6, 10)
+                decay = uniform(0.3, 0.8)
+                spin = uniform(5, 15)
+            elif mode == "STARS":
+                angle = uniform(0, math.pi * 2)
+                speed = uniform(10, 150)
+                vx = math.cos(angle) * speed
+                vy = math.sin(angle) * speed
+                size = randint(4, 9)
+                decay = uniform(0.2, 0.6)
+            elif mode == "FOUNTAIN":
+                angle = uniform(math.radians(250), math.radians(290))
+                speed = uniform(500, 900)
+                vx = math.cos(angle) * speed
+                vy = math.sin(angle) * speed
+                size = randint(3, 8)
+                decay = uniform(0.4, 0.7)
+            else:
+                vx = vy = 0.0
+                size = 5
+                decay = 1.0
+
+            # --- APPLY OVERRIDES (FROM LAB) ---
+            if 'size_min' in ov and 'size_max' in ov:
+                size = randint(ov['size_min'], ov['size_max'])
+            if 'decay_min' in ov and 'decay_max' in ov:
+                decay = uniform(ov['decay_min'], ov['decay_max'])
+            if 'speed_min' in ov and 'speed_max' in ov:
+                # Rescale velocity vector to new speed
+                current_speed = math.sqrt(vx**2 + vy**2)
+                if current_speed > 0:
+                    ratio = uniform(ov['speed_min'], ov['speed_max']) / current_speed
+                    vx *= ratio
+                    vy *= ratio
+
+            self.x.append(x); self.y.append(y)
+            self.vx.append(vx); self.vy.append(vy)
+            self.life.append(1.0); self.decay.append(decay)
+            self.rotation.append(0.0); self.spin.append(spin)
+            self.style.append(self._style(random.choice(palette), max(1, size)))
 
     def update(self, dt, screen_h):
-        for p in self.particles:
-            p.update(dt, screen_h)
-        self.particles = [p for p in self.particles if p.life > 0]
+        if not self.life: return
+        gravity, drag, bounce = self._physics()
+        gdt = gravity * dt
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+
+        # Whole-array passes, written back in place
+        life[:] = [l - d * dt for l, d in zip(life, self.decay)]
+        vx[:] = [v * drag for v in vx]
+        vy[:] = [v * drag + gdt for v in vy]
+        x[:] = [p + v * dt for p, v in zip(x, vx)]
+        y[:] = [p + v * dt for p, v in zip(y, vy)]
+        if self.mode == "POPPER":
+            spin_dt = dt * 10
+            self.rotation[:] = [r + s * spin_dt for r, s in zip(self.rotation, self.spin)]
+
+        if bounce and max(y) > screen_h:
+            for i in [i for i, p in enumerate(y) if p > screen_h]:
+                y[i] = screen_h
+                vy[i] *= -0.6
+                vx[i] *= 0.8
+
+        # Drop the dead ones (only when there are any)
+        if min(life) <= 0:
+            alive = [l > 0 for l in life]
+            for name in self.ATTRS:
+                arr = getattr(self, name)
+                arr[:] = compress(arr, alive)
 
     def draw(self, surface):
-        for p in self.particles:
-            p.draw(surface)
\ No newline at end of file
+        if not self.life: return
+        mode = self.mode
+        B = ALPHA_BUCKETS
+        buckets = [int(l * B) for l in self.life]
+
+        if mode == "POPPER":
+            # Sprite width follows |sin(rotation)|, quantised to SPIN_BUCKETS steps
+            table = [[(self.atlas.row(mode, color, size, max(1, size * step // SPIN_BUCKETS)),
+                       max(1, size * step // SPIN_BUCKETS) / 2, size / 2) for step in range(SPIN_BUCKETS + 1)]
+                     for color, size in self.styles]
+            batch = []
+            for st, b, r, px, py in zip(self.style, buckets, self.rotation, self.x, self.y):
+                row, ox, oy = table[st][round(abs(math.sin(r)) * SPIN_BUCKETS)]
+                batch.append((row[b], (int(px - ox), int(py - oy))))
+        elif mode == "STARS":
+            # Twinkle is driven by the clock, so it's the same for every particle this frame
+            twinkle = math.sin(pygame.time.get_ticks() * 0.01) * 2
+            table = []
+            for color, size in self.styles:
+                r = max(1, int(size + twinkle))
+                table.append((self.atlas.row(mode, color, size, r), r))
+            batch = [(table[st][0][b], (int(px) - table[st][1], int(py) - table[st][1]))
+                     for st, b, px, py in zip(self.style, buckets, self.x, self.y)]
+        else:
+            # Positions go in as floats: blits truncates them the same way int() does,
+            # and zip builds the pairs without a trip through the interpreter
+            rows = [self.atlas.row(mode, color, size) for color, size in self.styles]
+            batch = zip([rows[st][b] for st, b in zip(self.style, buckets)], zip(self.x, self.y))
+        surface.blits(batch, False)
\ No newline at end of file
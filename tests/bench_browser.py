@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+from src.core.utils import generate_hash, generate_auto_name
+
+class BrowserStorage:
+    """
+    In-memory stand-in for what TabbedBrowser reads from Storage, with the same lookups
+    (hashing, auto names) so the costs are real. No files, no threads, no network.
+    """
+    def __init__(self, recents):
+        self.data = {"recents": recents, "imported": [], "local_scenarios": {}, "stars": {}}
+        self.online_revision = 0
+
+    def is_starred(self, tab_name, config_data):
+        return generate_hash(config_data) in self.data["stars"].get(tab_name, [])
+
+    def get_display_name(self, config_data):
+        return config_data.get("name") or generate_auto_name(config_data)
+
+    def get_high_score(self, config_hash):
+        return 0.0
+
+def benchmark(items=1000, frames=300):
+    """
+    Times TabbedBrowser.refresh and draw with a RECENT tab of 'items' scenarios, headless.
+    Returns (refresh_ms, draw_p50_ms, draw_p95_ms).
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from src.ui.elements import TabbedBrowser
+    pygame.init()
+    screen = pygame.display.set_mode((1600, 900))
+    font = pygame.font.SysFont(["segoe ui symbol", "arial", "sans-serif"], 20)
+
+    storage = BrowserStorage([{"start_speed": 100 + i, "end_speed": 900, "tolerance": 75, "duration": 60}
+                              for i in range(items)])
+    browser = TabbedBrowser(50, 100, 500, 700, storage, start_tab=3)
+
+    t = time.perf_counter()
+    browser.refresh()
+    refresh_ms = (time.perf_counter() - t) * 1000
+
+    times = []
+    for i in range(frames):
+        browser.scroll_y = (i * 37) % max(1, items * 25 - 660) # Keep new rows coming into view
+        t = time.perf_counter()
+        browser.draw(screen, font)
+        times.append((time.perf_counter() - t) * 1000)
+    times.sort()
+    return refresh_ms, times[len(times) // 2], times[int(len(times) * 0.95)]
+
+if __name__ == "__main__":
+    # python -m tests.bench_browser [items] [frames]
+    args = [int(a) for a in sys.argv[1:3]]
+    refresh_ms, p50, p95 = benchmark(*args)
+    print(f"refresh {refresh_ms:6.2f}ms   draw p50 {p50:6.3f}ms  p95 {p95:6.3f}ms")
\ No newline at end of file
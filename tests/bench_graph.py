@@ -0,0 +1,111 @@
+import sys
+import math
+import time
+import random
+from tests.helpers import BenchApp
+
+CONFIG = {
+    "duration": 30, "smoothing": 15, "zoom_scale": 3,
+    "timeline": [
+        {"time": 0, "speed": 300, "tolerance": 60},
+        {"time": 10, "speed": 900, "tolerance": 120},
+        {"time": 20, "speed": 100, "tolerance": 150},
+    ],
+}
+
+def old_draw_graph_view(game, screen, surf):
+    """
+    The graph renderer from before the retained past layer: every column of both halves
+    is rebuilt and drawn each frame through one full screen alpha surface.
+    """
+    import pygame
+    import src.core.config as cfg
+    from src.core.config import COLOR_ZONE_LINE
+    from src.vfx.graph import GRAPH_COLORS, BAND_FILL
+
+    rect = pygame.Rect(0, 0, cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT - 100)
+    scale = game.config.get("zoom_scale", 3) * 0.2
+    cx = cfg.SCREEN_WIDTH // 2
+    surf.fill((0, 0, 0, 0))
+
+    points = game.engine.graph_points
+    if len(points) > 1:
+        upper_past, lower_past, line_pts = [], [], []
+        speeds, codes, targets, tols = points.window(cx)
+        offset = len(speeds) - 1
+        for i, (spd, code, tgt, h_tol) in enumerate(zip(speeds, codes, targets, tols)):
+            x = cx - (offset - i)
+            upper_past.append((x, max(0, rect.bottom - ((tgt + h_tol) * scale))))
+            lower_past.append((x, max(0, rect.bottom - ((tgt - h_tol) * scale))))
+            line_pts.append((x, max(0, rect.bottom - (spd * scale)), GRAPH_COLORS[code]))
+        if len(upper_past) > 1:
+            pygame.draw.polygon(surf, BAND_FILL, upper_past + lower_past[::-1])
+            pygame.draw.lines(screen, COLOR_ZONE_LINE, False, upper_past, 1)
+            pygame.draw.lines(screen, COLOR_ZONE_LINE, False, lower_past, 1)
+        for i in range(len(line_pts) - 1):
+            p1, p2 = line_pts[i], line_pts[i + 1]
+            pygame.draw.line(screen, p2[2], (p1[0], p1[1]), (p2[0], p2[1]), 2)
+
+    future_pixels = cfg.SCREEN_WIDTH - cx
+    upper_ys, lower_ys = game.band.window(game.sim.get_render_timer(), future_pixels)
+    xs = range(cx, cx + future_pixels)
+    upper_fut = list(zip(xs, upper_ys)); lower_fut = list(zip(xs, lower_ys))
+    if len(upper_fut) > 1:
+        pygame.draw.polygon(surf, BAND_FILL, upper_fut + lower_fut[::-1])
+        pygame.draw.lines(screen, (60, 60, 60), False, upper_fut, 1)
+        pygame.draw.lines(screen, (60, 60, 60), False, lower_fut, 1)
+    screen.blit(surf, (0, 0))
+    pygame.draw.line(screen, (100, 100, 100), (cx, 0), (cx, rect.bottom), 1)
+
+def count_diff(a, b):
+    """Number of pixels that differ between two same sized surfaces."""
+    ra, rb = a.get_buffer().raw, b.get_buffer().raw
+    if ra == rb: return 0
+    step = a.get_bytesize()
+    return sum(1 for i in range(0, len(ra), step) if ra[i:i + step] != rb[i:i + step])
+
+def benchmark(frames=3000, width=1600, height=900, check_every=500):
+    """
+    Old vs retained graph renderer on the same run (uneven frame times, a noisy speed
+    trace), headless at HIGH quality. Returns (old_ms, new_ms, worst_diff_pixels);
+    the pixel diff is sampled every 'check_every' frames and on the last one.
+    """
+    import pygame
+    from src.core.config import BG_COLOR
+    from src.states.game import GameState
+
+    app = BenchApp(width, height)
+    game = GameState(app)
+    game.startup({"mode": "CHALLENGE", "config": CONFIG, "name": "Benchmark", "origin": "LOCAL"})
+    pygame.event.set_grab(False)
+
+    old_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    old_screen, new_screen = pygame.Surface((width, height)), pygame.Surface((width, height))
+    rng = random.Random(2)
+    old_t = new_t = 0.0
+    worst = 0
+    timer = 0.0
+    for f in range(frames):
+        dt = rng.choice([1 / 144, 1 / 144, 1 / 60, 1 / 500, 0.03])
+        timer += dt
+        v = 500 + 400 * math.sin(timer * 2) + rng.uniform(-300, 300)
+        game.sim.step(dt, v * dt * rng.choice([1, -1, 0.5]), v * dt * rng.uniform(-0.3, 0.3))
+
+        old_screen.fill(BG_COLOR)
+        t0 = time.perf_counter()
+        old_draw_graph_view(game, old_screen, old_surf)
+        t1 = time.perf_counter()
+        new_screen.fill(BG_COLOR)
+        game.draw_graph_view(new_screen)
+        t2 = time.perf_counter()
+        old_t += t1 - t0; new_t += t2 - t1
+
+        if f % check_every == 0 or f == frames - 1:
+            worst = max(worst, count_diff(old_screen, new_screen))
+    return old_t / frames * 1000, new_t / frames * 1000, worst
+
+if __name__ == "__main__":
+    # python -m tests.bench_graph [frames] [width] [height]
+    args = [int(a) for a in sys.argv[1:4]]
+    old_ms, new_ms, worst = benchmark(*args)
+    print(f"old {old_ms:6.3f}ms  new {new_ms:6.3f}ms  worst diff {worst} px")
\ No newline at end of file
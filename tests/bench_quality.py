@@ -0,0 +1,48 @@
+import sys
+from tests.helpers import BenchApp
+
+def benchmark(frames=300, width=1600, height=900):
+    """
+    Times the heaviest scene (live graph plus a FOUNTAIN personal best result screen)
+    at every fixed quality level, headless. Returns {name: (p50_ms, p95_ms)} for the draw.
+    Runs on a BenchApp, so nothing is read from or written to the player's data.
+    """
+    import src.core.config as cfg
+    from src.core.quality import QUALITY_NAMES
+    from src.core.profiler import FrameProfiler
+    from src.states.game import GameState
+
+    app = BenchApp(width, height)
+    game = GameState(app)
+
+    config = {"duration": 60, "start_speed": 300, "end_speed": 900, "tolerance": 75}
+    dt = 1.0 / cfg.TARGET_FPS
+    results = {}
+    for name in QUALITY_NAMES:
+        app.quality.set_mode(name)
+        game.vfx_mode = "FOUNTAIN"
+        game.particles.set_mode("FOUNTAIN")
+        game.startup({"mode": "CHALLENGE", "config": config, "name": "Benchmark"})
+        game.sim.timer = 10.0
+        for i in range(cfg.SCREEN_WIDTH):
+            game.sim.step(dt, 4 + i % 7, 0)
+        game.sim.finished = True # Result screen, without saving anything
+        game.is_pb = True
+
+        prof = FrameProfiler(0)
+        for i in range(frames):
+            game.particles.emit(width // 2, height + 10, count=50)
+            game.update(dt)
+            prof.begin_frame()
+            with prof.stage("draw"): game.draw(app.screen)
+            prof.end_frame("GAME")
+        stats = prof.get_stats()["frame"]
+        prof.close()
+        results[name] = (stats[0], stats[1])
+    return results
+
+if __name__ == "__main__":
+    # python -m tests.bench_quality [frames] [width] [height]
+    args = [int(a) for a in sys.argv[1:4]]
+    for name, (p50, p95) in benchmark(*args).items():
+        print(f"{name:<8} p50 {p50:6.2f}ms  p95 {p95:6.2f}ms")
\ No newline at end of file
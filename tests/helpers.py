@@ -0,0 +1,38 @@
+import os
+
+class BenchStorage:
+    """Stands in for Storage: no PBs, nothing saved, no files opened."""
+    def get_high_score(self, config_hash):
+        return 0.0
+
+    def save_run(self, entry, trace=None, sensitivity=100):
+        pass
+
+class BenchAudio:
+    def update(self, *args):
+        pass
+
+    def stop_all(self):
+        pass
+
+class BenchApp:
+    """
+    Just enough of TosokuApp to drive a GameState headless: no mixer, no network, and
+    no Storage, so tests and benchmarks never touch the player's data directory.
+    """
+    def __init__(self, width=1600, height=900):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        import src.core.config as cfg
+        from src.core.profiler import FrameProfiler
+        from src.core.quality import QualityGovernor
+
+        pygame.init()
+        cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT = width, height
+        self.screen = pygame.display.set_mode((width, height))
+        self.global_settings = {"sensitivity": 100}
+        self.storage = BenchStorage()
+        self.audio = BenchAudio()
+        self.profiler = FrameProfiler(0) # No hitch log
+        self.quality = QualityGovernor(cfg.TARGET_FPS, auto=False)
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import math
+import unittest
+
+class SynthesisTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        from src.engine.audio import AudioEngine
+        cls.engine = AudioEngine()
+
+    def test_sine_block_matches_per_sample(self):
+        eng = self.engine
+        sr = eng.sample_rate
+        table = eng._sine_table()
+        for freq in (1, 150, 151, 440, 997, 1999, sr // 2, sr + 7):
+            for n in (None, 4410, 3):
+                with self.subTest(freq=freq, n=n):
+                    block = eng._sine_block(freq, n)
+                    length = n if n is not None else sr // math.gcd(sr, freq)
+                    self.assertEqual(list(block), [table[(freq * i) % sr] for i in range(length)])
+
+    def test_pulse_envelope(self):
+        eng = self.engine
+        n = len(eng._make_pulse(997))
+        wave = eng._sine_block(997, n)
+        self.assertEqual(list(eng._make_pulse(997)), [int(wave[i] * (1.0 - i / n)) for i in range(n)])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import random
+import unittest
+from unittest import mock
+from tests.helpers import BenchApp
+from src.engine.traces import SAMPLE_FIELDS
+from src.engine.simulation import simulate
+
+CONFIG = {"duration": 1, "start_speed": 300, "end_speed": 300, "tolerance": 75}
+
+class FinishChallengeTest(unittest.TestCase):
+    def test_trace_handed_over(self):
+        from src.states.game import GameState
+        app = BenchApp(320, 240)
+        saved = []
+        app.storage.save_run = lambda entry, trace=None, sensitivity=100: saved.append(trace)
+        game = GameState(app)
+        game.startup({"mode": "CHALLENGE", "config": CONFIG, "name": "Test"})
+        while not game.sim.finished:
+            game.update(1 / 144)
+        for i in range(100): # Result screen keeps updating while the writer has the trace
+            game.update(1 / 144)
+
+        self.assertEqual(len(saved), 1)
+        self.assertIsNone(game.sim.trace)
+        self.assertEqual(len(saved[0]) // SAMPLE_FIELDS, 145)
+
+class LiveMatchesOfflineTest(unittest.TestCase):
+    def test_same_score_as_simulate(self):
+        from src.states.game import GameState
+        config = {"duration": 3, "warmup_time": 0.5, "smoothing": 15,
+                  "timeline": [{"time": 0, "speed": 300, "tolerance": 60}, {"time": 3, "speed": 700, "tolerance": 90}]}
+        rng = random.Random(5)
+        samples = []
+        for i in range(1000): # Uneven frames, a few hitches past MAX_DT, integer mouse counts
+            dt = rng.choice([1 / 60, 1 / 144, 1 / 144, 1 / 500, 0.15])
+            speed = 350 + 250 * (i % 200) / 200
+            samples.append((dt, round(speed * dt * rng.uniform(0.6, 1.4) / 1.3), rng.randint(-1, 1)))
+
+        app = BenchApp(320, 240)
+        app.global_settings["sensitivity"] = 130
+        game = GameState(app)
+        game.startup({"mode": "CHALLENGE", "config": config, "name": "Test"})
+        motion = iter([(dx, dy) for dt, dx, dy in samples])
+        with mock.patch("pygame.mouse.get_rel", lambda: next(motion)):
+            for dt, dx, dy in samples:
+                game.update(dt)
+                if game.sim.finished: break
+        self.assertTrue(game.sim.finished)
+
+        score, statuses, points = simulate(config, samples, sensitivity=130)
+        self.assertEqual(game.sim.score, score)
+        live_points = game.engine.graph_points.to_list() # Only as many as half the screen shows
+        self.assertEqual(live_points, points[-len(live_points):])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
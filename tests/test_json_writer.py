@@ -0,0 +1,66 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from src.engine.json_writer import JsonWriter
+
+class JsonWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+
+    def read(self, path):
+        with open(path) as f: return json.load(f)
+
+    def test_snapshot_at_save(self):
+        writer = JsonWriter(delay=0.05)
+        path = os.path.join(self.dir, "data.json")
+        data = {"stars": [1]}
+        writer.save(path, data)
+        data["stars"].append(2) # Edited after save, before the write
+        writer.close()
+        self.assertEqual(self.read(path), {"stars": [1]})
+
+    def test_failed_write_is_retried(self):
+        writer = JsonWriter(delay=0.05, retry=60)
+        folder = os.path.join(self.dir, "missing")
+        path = os.path.join(folder, "data.json")
+        writer.save(path, {"a": 1})
+        writer.flush() # Folder doesn't exist: fails, but the save is kept
+        self.assertFalse(os.path.exists(path))
+        self.assertIn(path, writer.pending)
+
+        os.makedirs(folder)
+        writer.flush()
+        self.assertEqual(self.read(path), {"a": 1})
+        self.assertEqual(writer.writes, 1)
+        writer.close()
+
+    def test_newer_save_wins_over_retry(self):
+        writer = JsonWriter(delay=0.05, retry=60)
+        folder = os.path.join(self.dir, "missing")
+        path = os.path.join(folder, "data.json")
+        writer.save(path, {"a": 1})
+        writer.flush()
+        os.makedirs(folder)
+        writer.save(path, {"a": 2})
+        writer.close()
+        self.assertEqual(self.read(path), {"a": 2})
+
+    def test_close_gives_up_on_persistent_failure(self):
+        writer = JsonWriter(delay=0.05)
+        writer.save(os.path.join(self.dir, "missing", "data.json"), {"a": 1})
+        writer.close()
+        self.assertFalse(writer.thread.is_alive())
+
+    def test_unserializable_keeps_previous(self):
+        writer = JsonWriter(delay=0.05)
+        path = os.path.join(self.dir, "data.json")
+        writer.save(path, {"a": 1})
+        writer.save(path, {"a": object()})
+        writer.close()
+        self.assertEqual(self.read(path), {"a": 1})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
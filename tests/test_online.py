@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from src.engine import storage as storage_mod
+from src.engine.storage import Storage, ONLINE_LOADING_ROWS, ONLINE_FAILED_ROWS
+
+class ListHandler(BaseHTTPRequestHandler):
+    """Serves server.body with server.etag, answering 304 to a matching If-None-Match."""
+    def do_GET(self):
+        tag = self.headers.get("If-None-Match")
+        self.server.hits.append(tag)
+        if tag == self.server.etag:
+            self.send_response(304); self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+def scenario_list(*names):
+    return json.dumps([{"name": n, "data": {"start_speed": 300}} for n in names]).encode()
+
+class OnlineListTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        # Storage only ever sees the temp folder, never the real data dir
+        paths = {name: os.path.join(self.dir, name.lower()) for name in
+                 ("STATS_FILE", "SETTINGS_FILE", "DATA_FILE", "TRACES_FILE", "TRACES_INDEX_FILE",
+                  "RUNS_DB_FILE", "SCENARIO_STORE_FILE")}
+        paths["SCENARIOS_DIR"] = os.path.join(self.dir, "scenarios")
+        paths["HTTP_CACHE_DIR"] = os.path.join(self.dir, "http_cache")
+        patcher = mock.patch.multiple(storage_mod, **paths)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("src.engine.fetch.BACKOFF", 0.0) # Dead server fails fast
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server = HTTPServer(("127.0.0.1", 0), ListHandler)
+        self.server.body, self.server.etag, self.server.hits = scenario_list("A"), '"v1"', []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/list.json"
+
+    def open_storage(self):
+        storage = Storage()
+        self.addCleanup(storage.close)
+        return storage
+
+    def settle(self, storage):
+        """Runs the fetch callbacks like the main loop would, until nothing is in flight."""
+        deadline = time.monotonic() + 10
+        while storage.fetcher.pending():
+            self.assertLess(time.monotonic(), deadline)
+            storage.fetcher.dispatch()
+            time.sleep(0.01)
+
+    def names(self, rows):
+        return [row["name"] for row in rows]
+
+    def test_revalidation(self):
+        # Cold: loading row, then the list (200)
+        s = self.open_storage()
+        self.assertEqual(s.get_online_scenarios(self.url), ONLINE_LOADING_ROWS)
+        self.settle(s)
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["A"])
+        self.assertEqual(s.online_revision, 1)
+        self.assertEqual(self.server.hits, [None])
+
+        # Reopen: cached copy at once, revalidated with a 304
+        s = self.open_storage()
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["A"])
+        self.settle(s)
+        self.assertEqual(self.server.hits, [None, '"v1"'])
+        self.assertEqual(s.online_revision, 0)
+
+        # Changed ETag: stale copy first, then the new list
+        self.server.body, self.server.etag = scenario_list("B", "C"), '"v2"'
+        s = self.open_storage()
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["A"])
+        self.settle(s)
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["B", "C"])
+        self.assertEqual(s.online_revision, 1)
+
+        # Dead server: the cached list stays, a never fetched one shows the error rows
+        self.server.shutdown()
+        self.server.server_close()
+        s = self.open_storage()
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["B", "C"])
+        other = self.url.replace("list.json", "other.json")
+        self.assertEqual(s.get_online_scenarios(other), ONLINE_LOADING_ROWS)
+        self.settle(s)
+        self.assertTrue(s.online[self.url]["failed"])
+        self.assertEqual(self.names(s.get_online_scenarios(self.url)), ["B", "C"])
+        self.assertEqual(s.get_online_scenarios(other), ONLINE_FAILED_ROWS)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import random
+import unittest
+from src.engine.physics import Engine, SpeedWindow, scan_speed, REFERENCE_FPS
+
+class SpeedWindowParityTest(unittest.TestCase):
+    """SpeedWindow against the old backwards scan over raw_history."""
+
+    def run_engine(self, smoothing, frames, seed, change_at=None):
+        rng = random.Random(seed)
+        engine = Engine()
+        engine.smoothing_window = smoothing
+        for i in range(frames):
+            if i == change_at: engine.smoothing_window = smoothing + 7 # Rebuild path
+            dt = rng.choice([1/60, 1/144, 1/1000, rng.uniform(0.0005, 0.05)])
+            speed, status, diff = engine.process_frame(rng.uniform(-20, 20), rng.uniform(-20, 20), dt, 500, 50, [True] * 4)
+            ref = scan_speed(engine.raw_history, engine.smoothing_window / REFERENCE_FPS)
+            if abs(speed - ref) > 1e-6 * max(1.0, ref): # Time is whole ns in the window
+                # Only allowed on an exact tie: the window covers the duration to the
+                # nanosecond, while the float scan falls a rounding error short and
+                # takes one more sample
+                window = engine.window
+                self.assertEqual(window.total_ns, window.duration_ns,
+                                 f"smoothing {engine.smoothing_window} frame {i}: {speed} vs {ref}")
+
+    def test_parity(self):
+        for smoothing in (0, 1, 15, 75, 100, 500):
+            with self.subTest(smoothing=smoothing):
+                self.run_engine(smoothing, 5000, seed=smoothing, change_at=2500)
+
+    def test_uneven_frames(self):
+        # Random frame times never tie, so these have to match the scan (to ns rounding)
+        rng = random.Random(7)
+        window = SpeedWindow(75 / REFERENCE_FPS, max_samples=1200)
+        history = []
+        for i in range(5000):
+            dt, dist = rng.uniform(0.0002, 0.03), rng.uniform(0, 40)
+            window.push(dt, dist)
+            history.append((dt, dist))
+            ref = scan_speed(history[-1200:], window.duration)
+            speed = window.total_dist / window.total_time if window.total_time > 0.0001 else 0.0
+            self.assertAlmostEqual(speed, ref, delta=1e-6 * max(1.0, ref))
+
+    def test_history_cap(self):
+        # A window longer than the history is limited to max_samples, like the deque was
+        window = SpeedWindow(10.0, max_samples=50)
+        for i in range(200):
+            window.push(0.001, 1.0)
+        self.assertEqual(len(window.samples), 50)
+        self.assertAlmostEqual(window.total_dist, 50.0)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
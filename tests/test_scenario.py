@@ -0,0 +1,63 @@
+import random
+import unittest
+from src.engine.scenario import Scenario, Keyframe, scan_state
+
+DIRS = [[True, True, True, True], [False, False, True, True], [True, True, False, False]]
+
+def random_timeline(rng, duration):
+    """Keyframes on a coarse grid, so equal times are common, and some outside 0..duration."""
+    grid = [-2.0, 0.0, 0.5, 1.0, 2.5, duration / 2, duration, duration + 3]
+    return [{"time": rng.choice(grid), "speed": rng.randint(100, 1500), "tolerance": rng.randint(20, 150),
+             "directions": rng.choice(DIRS)} for i in range(rng.randint(1, 30))]
+
+def reference_keyframes(timeline):
+    """What the old from_config built: one add_keyframe (append + stable sort) per entry."""
+    keyframes = []
+    for kf in timeline:
+        keyframes.append(Keyframe(kf["time"], kf["speed"], kf["tolerance"], kf["directions"]))
+        keyframes.sort(key=lambda k: k.time)
+    return keyframes
+
+def queries(rng, scenario):
+    """Forward sweep, then the keyframe times themselves, then random jumps back and forth."""
+    d = scenario.duration
+    ts = [i * 0.001 * d for i in range(1100)]
+    ts += [kf.time for kf in scenario.keyframes]
+    ts += [rng.uniform(-1, d + 1) for i in range(300)]
+    ts += [d, 0, d, -5, d * 2, 0.0]
+    return ts
+
+class TimelineParityTest(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        for case in range(200):
+            duration = rng.choice([5.0, 10.0, 20.0])
+            timeline = random_timeline(rng, duration)
+            scenario = Scenario.from_config({"duration": duration, "timeline": timeline})
+            reference = reference_keyframes(timeline)
+            self.assertEqual([(k.time, k.speed) for k in scenario.keyframes], [(k.time, k.speed) for k in reference])
+            for t in queries(rng, scenario):
+                self.assertEqual(scenario.get_state_at(t), scan_state(reference, duration, t), (case, t))
+
+    def test_simple_config(self):
+        scenario = Scenario.from_config({"duration": 10, "start_speed": 300, "end_speed": 900, "tolerance": 60})
+        reference = reference_keyframes([{"time": 0.0, "speed": 300.0, "tolerance": 60.0, "directions": DIRS[0]},
+                                         {"time": 10.0, "speed": 900.0, "tolerance": 60.0, "directions": DIRS[0]}])
+        for t in (-1, 0, 2.5, 5, 9.999, 10, 11, 3, 0.5):
+            self.assertEqual(scenario.get_state_at(t), scan_state(reference, 10.0, t))
+
+    def test_add_keyframe_after_lookups(self):
+        # Inserting recompiles: the cursor from earlier lookups must not leak into new results
+        rng = random.Random(3)
+        scenario = Scenario(10.0)
+        reference = []
+        for i in range(40):
+            t, speed = rng.choice([0.0, 1.0, 1.0, 4.0, 7.5, 10.0]), rng.randint(100, 900)
+            scenario.add_keyframe(t, speed, 50, DIRS[i % 3])
+            reference.append(Keyframe(t, speed, 50, DIRS[i % 3]))
+            reference.sort(key=lambda k: k.time)
+            for q in (9.0, 0.5, 4.0, 1.0, 10.0, 7.0):
+                self.assertEqual(scenario.get_state_at(q), scan_state(reference, 10.0, q))
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import functools
+import unittest
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from src.engine.scenario_sync import ScenarioSync, build, check, item_hash
+from src.engine.fetch import FetchService
+from src.engine.http_cache import HttpCache
+from src.engine.json_writer import JsonWriter
+
+class FileHandler(SimpleHTTPRequestHandler):
+    """Static files like GitHub raw (Last-Modified / 304), logging (file, code) per request."""
+    def log_request(self, code='-', size='-'):
+        self.server.requests.append((os.path.basename(self.path), int(code)))
+
+    def log_message(self, *args):
+        pass
+
+def scenarios(count):
+    return [{"name": f"S{i}", "data": {"start_speed": 100 + i, "end_speed": 500, "tolerance": 75, "duration": 60}}
+            for i in range(count)]
+
+class ScenarioSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.site = os.path.join(self.dir, "site")
+        self.store_path = os.path.join(self.dir, "scenario_store.json")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(FileHandler, directory=self.site))
+        self.server.requests = []
+        self.published = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/manifest.json"
+
+        self.fetcher = FetchService()
+        self.http_cache = HttpCache(os.path.join(self.dir, "http_cache"))
+        self.json_writer = JsonWriter(delay=0.01)
+        self.addCleanup(self.json_writer.close)
+
+    def publish(self, items):
+        manifest = build(items, self.site, prefix=1)
+        # Each publish is clearly newer than the last, whatever the mtime granularity
+        self.published += 1
+        stamp = time.time() + 10 * self.published
+        os.utime(os.path.join(self.site, "manifest.json"), (stamp, stamp))
+        return manifest
+
+    def open_sync(self):
+        """A fresh session: new ScenarioSync over the same store and cache, synced to the end."""
+        self.json_writer.flush() # Previous session's store on disk
+        self.server.requests.clear()
+        sync = ScenarioSync(self.url, self.store_path, self.fetcher, self.http_cache, self.json_writer)
+        shown = sync.items
+        sync.sync()
+        deadline = time.monotonic() + 10
+        while self.fetcher.pending():
+            self.assertLess(time.monotonic(), deadline)
+            self.fetcher.dispatch()
+            time.sleep(0.01)
+        return shown, sync
+
+    def names(self, items):
+        return [item["name"] for item in items]
+
+    def pack_requests(self, packs):
+        return sorted([("manifest.json", 200)] + [(os.path.basename(p), 200) for p in packs])
+
+    def pack_of(self, manifest, item):
+        h = item_hash(item)
+        return next(manifest["packs"][idx] for i, idx, digest in manifest["items"] if i == h)
+
+    def test_incremental_sync(self):
+        items = scenarios(10)
+        manifest = self.publish(items)
+        self.assertEqual(len(manifest["packs"]), len({item_hash(item)[0] for item in items}))
+
+        # Cold: manifest plus every pack
+        shown, sync = self.open_sync()
+        self.assertIsNone(shown)
+        self.assertEqual(self.names(sync.items), self.names(items))
+        self.assertEqual(sorted(self.server.requests), self.pack_requests(manifest["packs"]))
+
+        # Reopen: the store shows at once, revalidation is one 304
+        shown, sync = self.open_sync()
+        self.assertEqual(self.names(shown), self.names(items))
+        self.assertEqual(self.server.requests, [("manifest.json", 304)])
+        self.assertFalse(sync.failed)
+
+        # One scenario renamed: only its pack is downloaded again
+        items[5]["name"] = "Renamed"
+        changed = self.publish(items)
+        new_packs = set(changed["packs"]) - set(manifest["packs"])
+        self.assertEqual(new_packs, {self.pack_of(changed, items[5])})
+        shown, sync = self.open_sync()
+        self.assertEqual(self.names(shown)[5], "S5") # Stale copy until the sync is done
+        self.assertEqual(sorted(self.server.requests), self.pack_requests(new_packs))
+        self.assertEqual(self.names(sync.items), self.names(items))
+
+    def test_insert_and_delete(self):
+        items = scenarios(10)
+        manifest = self.publish(items)
+        self.open_sync()
+
+        # Inserted mid-list, into a pack that already exists: that pack gets a new name,
+        # the rest keep theirs, and only the one pack is fetched
+        items.insert(3, {"name": "Inserted", "data": {"start_speed": 718, "end_speed": 500, "tolerance": 75, "duration": 60}})
+        inserted = self.publish(items)
+        self.assertEqual(len(inserted["packs"]), len(manifest["packs"]))
+        new_packs = set(inserted["packs"]) - set(manifest["packs"])
+        self.assertEqual(new_packs, {self.pack_of(inserted, items[3])})
+        shown, sync = self.open_sync()
+        self.assertEqual(sorted(self.server.requests), self.pack_requests(new_packs))
+        self.assertEqual(self.names(sync.items), self.names(items))
+
+        # Deleted from a pack that keeps other scenarios: the pack is renamed, but the store
+        # already has everything that's left, so only the manifest is fetched
+        renamed = self.pack_of(inserted, items[5])
+        del items[5]
+        deleted = self.publish(items)
+        self.assertNotIn(renamed, deleted["packs"])
+        self.assertEqual(len(deleted["packs"]), len(inserted["packs"]))
+        shown, sync = self.open_sync()
+        self.assertEqual(self.server.requests, [("manifest.json", 200)])
+        self.assertEqual(self.names(sync.items), self.names(items))
+        self.assertFalse(sync.failed)
+
+        # Packs nothing lists any more are gone from the site
+        self.assertEqual(sorted(f"packs/{f}" for f in os.listdir(os.path.join(self.site, "packs"))),
+                         sorted(deleted["packs"]))
+
+    def test_check_against_list(self):
+        items = scenarios(10)
+        self.assertTrue(check(items, self.site, prefix=1)) # Nothing published yet
+        build(items, self.site, prefix=1)
+        self.assertEqual(check(items, self.site, prefix=1), [])
+
+        stale = os.path.join(self.site, "packs", "0123abcd.json") # Left over from an older build
+        with open(stale, 'w') as f: f.write("[]")
+        self.assertEqual(check(items, self.site, prefix=1), ["packs/0123abcd.json is no longer listed"])
+        build(items, self.site, prefix=1)
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(check(items, self.site, prefix=1), [])
+
+        items.append({"name": "New", "data": {"start_speed": 999}}) # List edited, not rebuilt
+        self.assertTrue(check(items, self.site, prefix=1))
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import math
+import unittest
+from src.engine.simulation import Simulation, simulate, MAX_DT
+from src.engine.traces import SAMPLE_FIELDS
+
+CONFIG = {"duration": 1, "start_speed": 300, "end_speed": 300, "tolerance": 75}
+# 300 +- 75 px/s for 2 seconds
+STEADY = {"duration": 2, "start_speed": 300, "end_speed": 300, "tolerance": 75, "smoothing": 15}
+
+def stream(fps, seconds, speed_at):
+    """(dt, dx, dy) frames at 'fps' moving right at speed_at(t) px/s (sampled mid-frame)."""
+    dt = 1.0 / fps
+    return [(dt, speed_at((i + 0.5) * dt) * dt, 0.0) for i in range(int(seconds * fps) + 2)]
+
+class TraceRecordingTest(unittest.TestCase):
+    def test_stops_when_finished(self):
+        sim = Simulation(CONFIG, record=True)
+        while not sim.finished:
+            sim.step(1 / 144, 3, 0)
+        recorded = len(sim.trace)
+        for i in range(100): # Result screen
+            sim.step(1 / 144, 3, 0)
+        self.assertEqual(len(sim.trace), recorded)
+        self.assertEqual(recorded // SAMPLE_FIELDS, 145)
+
+    def test_records_before_clamp(self):
+        sim = Simulation(CONFIG, record=True)
+        sim.step(MAX_DT * 3, 1, 2)
+        self.assertEqual(list(sim.trace), [round(MAX_DT * 3 * 1e9), 1, 2])
+
+class ScoringTest(unittest.TestCase):
+    def test_known_streams(self):
+        score, statuses, points = simulate(STEADY, stream(144, 3, lambda t: 300))
+        self.assertAlmostEqual(score, 100.0, places=6)
+        self.assertEqual(set(statuses), {"PERFECT"})
+        self.assertTrue(points)
+
+        score, statuses, points = simulate(STEADY, stream(144, 3, lambda t: 100))
+        self.assertEqual(score, 0.0)
+        self.assertEqual(set(statuses), {"LOW"})
+
+        # In the zone for the first second, then stopped: the smoothed speed stays above
+        # 225 until a quarter of the window (15/144 s) has emptied
+        score = simulate(STEADY, stream(144, 3, lambda t: 300 if t < 1 else 0))[0]
+        self.assertAlmostEqual(score, (1 + 0.25 * 15 / 144) / 2 * 100, delta=0.1)
+
+    def test_stream_ending_early(self):
+        # Closed where the stream stops: one second in the zone out of two
+        score = simulate(STEADY, stream(144, 1, lambda t: 300))[0]
+        self.assertAlmostEqual(score, 50.0, delta=1.0)
+
+    def test_warmup_not_scored(self):
+        config = dict(STEADY, warmup_time=1)
+        during = simulate(config, stream(144, 4, lambda t: 300 if t < 1 else 0))[0]
+        after = simulate(config, stream(144, 4, lambda t: 0 if t < 1 else 300))[0]
+        self.assertLess(during, 2.0)   # Only the smoothing tail reaches past the warmup
+        self.assertGreater(after, 95.0) # Only the window filling up at the start is lost
+
+    def test_sensitivity(self):
+        slow = stream(144, 3, lambda t: 150) # Half the target speed in raw counts
+        self.assertEqual(simulate(STEADY, slow)[0], 0.0)
+        self.assertAlmostEqual(simulate(STEADY, slow, sensitivity=200)[0], 100.0, places=6)
+        self.assertEqual(simulate(STEADY, stream(144, 3, lambda t: 300), sensitivity=50)[0], 0.0)
+
+class FrameRateTest(unittest.TestCase):
+    # Scores may differ by at most this many percentage points between frame rates. Some
+    # difference is inherent: a 60 FPS frame spreads its motion evenly over its steps.
+    TOLERANCE = 0.25
+
+    def test_same_score_at_60_144_500(self):
+        config = {"duration": 10, "smoothing": 5,
+                  "timeline": [{"time": 0, "speed": 300, "tolerance": 40}, {"time": 10, "speed": 700, "tolerance": 40}]}
+        motion = lambda t: 500 + 250 * math.sin(t * 9) # Crosses the zone edges a few times a second
+        scores = [simulate(config, stream(fps, 11, motion))[0] for fps in (60, 144, 500)]
+        self.assertTrue(5 < scores[0] < 95, scores) # Neither trivially in nor out of the zone
+        self.assertLessEqual(max(scores) - min(scores), self.TOLERANCE, scores)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
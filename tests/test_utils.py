@@ -0,0 +1,24 @@
+import unittest
+from src.core.utils import ScenarioConfig, generate_hash
+from src.engine.scenario import Scenario
+
+class ScenarioConfigTest(unittest.TestCase):
+    def test_numeric_strings(self):
+        data = {"start_speed": "300", "end_speed": 900, "tolerance": "75.5", "duration": "10",
+                "timeline": [{"time": "0", "speed": "300", "tolerance": 50}, {"time": 5, "speed": "600.0", "tolerance": "60"}]}
+        config = ScenarioConfig(data)
+        self.assertEqual(config["start_speed"], 300)
+        self.assertEqual(config["tolerance"], 75.5)
+        self.assertEqual(config["timeline"][1]["speed"], 600)
+        self.assertEqual(config.hash, generate_hash(data)) # PBs stay keyed on the data as saved
+        Scenario.from_config(config) # Playable, no strings left
+
+    def test_rejects_bad_values(self):
+        for data in ({"duration": "ten"}, {"tolerance": float("nan")}, {"start_speed": "inf"},
+                     {"timeline": [{"time": 0, "speed": None}]}, {"directions": [True]}, ["not", "a", "dict"]):
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    ScenarioConfig(data)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file